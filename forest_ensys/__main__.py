@@ -4,14 +4,21 @@
 
 import uvicorn
 
+from forest_ensys.core import settings
+
 
 def main():
+    # auto-reload only works with a single worker, so it is limited to DEV_MODE
     uvicorn.run(
         app="forest_ensys.app:app",
         host="0.0.0.0",
         port=8081,
         log_level="info",
-        reload=True,
+        reload=settings.DEV_MODE,
+        workers=1 if settings.DEV_MODE else settings.WORKERS,
+        loop="uvloop",
+        http="httptools",
+        access_log=settings.DEV_MODE,
     )
 
 
@@ -16,6 +16,7 @@ from .endpoints import (
     simulation_input_data,
     price_data,
     result_data,
+    jobs,
 )
 
 api_router = APIRouter()
@@ -48,3 +49,4 @@ api_router.include_router(
 )
 api_router.include_router(price_data.router, prefix="/prices", tags=["Prices"])
 api_router.include_router(result_data.router, prefix="/results", tags=["Results"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
@@ -9,10 +9,5 @@ from forest_ensys.database.session import SessionLocal
 
 
 def get_db() -> Generator:
-    db = None
-    try:
-        db = SessionLocal()
+    with SessionLocal() as db:
         yield db
-    finally:
-        if db is not None:
-            db.close()
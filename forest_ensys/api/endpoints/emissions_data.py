@@ -2,29 +2,69 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import List, Text, Optional
+from typing import Iterator, Text, Optional
+import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from forest_ensys import crud, model, schemas
 from forest_ensys.api import deps
 from forest_ensys.core import crawlers
+from forest_ensys.database.session import engine, SessionLocal
+
+logger = logging.getLogger(__name__)
+router = APIRouter(default_response_class=ORJSONResponse)
 
-router = APIRouter()
+# (payload version, table version) after the last crawl that was stored
+last_applied_emissions: Optional[tuple[str, str]] = None
 
 
-@router.get("/", response_model=List[schemas.Emissions])
+def stream_emissions(skip: int, limit: int) -> Iterator[bytes]:
+    """
+    Yield the emissions table as a JSON array, fetched through a server-side cursor.
+    """
+    statement = select(model.Emissions.__table__).offset(skip).limit(limit)
+    # named (server-side) cursors need a transaction, so leave autocommit here
+    with engine.connect().execution_options(
+        isolation_level="READ COMMITTED", stream_results=True, yield_per=1000
+    ) as connection:
+        yield b"["
+        for index, row in enumerate(connection.execute(statement).mappings()):
+            yield (b"," if index else b"") + orjson.dumps(dict(row))
+        yield b"]"
+
+
+@router.get("/", response_model=None, responses={304: {"description": "Not Modified"}})
 def get_all_emissions_data(
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-) -> List[schemas.Emissions]:
+) -> Response:
     """
     Retrieve all emissions data
     """
-    emissions_data = crud.emissions.get_multi(db=db, skip=skip, limit=limit)
-    return emissions_data
+    etag = f'W/"{crud.emissions.get_version(db=db)}-{skip}-{limit}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return StreamingResponse(
+        stream_emissions(skip=skip, limit=limit),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
 
 
 @router.get(
@@ -48,70 +88,106 @@ def get_emissions_data(
     return emissions_data
 
 
+def crawl_and_store_emissions_data(db: Session) -> int:
+    """
+    Crawl the most recent emissions data and store the rows that are not in the database yet.
+    """
+    global last_applied_emissions
+    try:
+        payload_version, body = crawlers.fetch_emissions_data()
+        timeseries_data = crawlers.parse_emissions_data(body)
+    except Exception:
+        raise HTTPException(
+            status_code=502,
+            detail="Could not retrieve emissions data. Server probably offline",
+        )
+    # same payload as the last update and the table was not touched since: nothing to do
+    if last_applied_emissions == (payload_version, crud.emissions.get_version(db=db)):
+        return 0
+    columns = [
+        "timestamp" if column == "datetime" else column
+        for column in timeseries_data.columns
+    ]
+    records = [
+        dict(zip(columns, row))
+        for row in timeseries_data.itertuples(index=False, name=None)
+    ]
+    inserted = crud.emissions.create_multi(db, obj_in=records)
+    if inserted:
+        crud.emissions.clear_cache()
+    last_applied_emissions = (payload_version, crud.emissions.get_version(db=db))
+    return inserted
+
+
+def run_emissions_update_job(job_id: str) -> None:
+    """Background task wrapper - creates its own DB session"""
+    with SessionLocal() as db:
+        crud.job.set_status(db, id=job_id, status="running")
+        try:
+            inserted = crawl_and_store_emissions_data(db)
+        except HTTPException as e:
+            crud.job.set_status(
+                db, id=job_id, status="failed", result={"message": e.detail}
+            )
+            return
+        except Exception as e:
+            logger.exception("Emissions data update failed")
+            db.rollback()
+            crud.job.set_status(
+                db, id=job_id, status="failed", result={"message": str(e)}
+            )
+            return
+        if not inserted:
+            crud.job.set_status(
+                db,
+                id=job_id,
+                status="failed",
+                result={
+                    "message": "Emissions data already exists. Please delete first if you want to update.",
+                    "inserted": inserted,
+                },
+            )
+            return
+        crud.job.set_status(
+            db,
+            id=job_id,
+            status="finished",
+            result={
+                "message": "Emissions data updated successfully",
+                "inserted": inserted,
+            },
+        )
+
+
 @router.post(
     "/",
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
-        200: {
-            "description": "Successful Response",
-            "content": {
-                "application/json": {
-                    "example": {"message": "Emissions data updated successfully"}
-                }
-            },
-        },
-        502: {
-            "description": "Server Error",
-            "content": {
-                "application/json": {
-                    "example": {
-                        "message": "Could not retrieve emissions data. Server probably offline"
-                    }
-                }
-            },
-        },
-        409: {
-            "description": "Conflict Error",
+        202: {
+            "description": "Update queued, poll /jobs/{job_id} for the result",
             "content": {
                 "application/json": {
                     "example": {
-                        "message": "Emissions data already exists. Please delete first if you want to update."
+                        "status": "accepted",
+                        "job_id": "3f2b9c0e4a5d4e6f8a7b6c5d4e3f2a1b",
                     }
                 }
             },
         },
     },
 )
-def update_emissions_data(db: Session = Depends(deps.get_db)) -> Text:
+def update_emissions_data(
+    background_tasks: BackgroundTasks, db: Session = Depends(deps.get_db)
+) -> Text:
     """
-    Retrieve the most recent emissions data
+    Retrieve the most recent emissions data in the background
     """
-    try:
-        timeseries_data = crawlers.crawl_emissions_data()
-    except Exception:
-        raise HTTPException(
-            status_code=502,
-            detail="Could not retrieve emissions data. Server probably offline",
-        )
-    timeseries_data.rename(columns={"datetime": "timestamp"}, inplace=True)
-    try:
-        crud.emissions.create_multi(
-            db, obj_in=timeseries_data.to_dict(orient="records")
-        )
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status": "Successful Response",
-                "message": "Emissions data updated successfully",
-            },
-        )
-    except Exception:
-        return JSONResponse(
-            status_code=status.HTTP_409_CONFLICT,
-            content={
-                "status": "Conflict Error",
-                "message": "Emissions data already exists. Please delete first if you want to update.",
-            },
-        )
+    job = crud.job.create(db=db, name="emissions_update")
+    background_tasks.add_task(run_emissions_update_job, job.id)
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"status": "accepted", "job_id": job.id},
+    )
 
 
 @router.delete(
@@ -132,8 +208,12 @@ def delete_emissions_data(db: Session = Depends(deps.get_db)) -> Text:
     Delete all emissions data
     """
     crud.emissions.delete(db=db)
-    raise HTTPException(
-        status_code=200, detail="Emissions data table deleted successfully"
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "status": "success",
+            "message": "Emissions data table deleted successfully",
+        },
     )
 
 
@@ -2,22 +2,27 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import Text
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Text, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from forest_ensys import crud, schemas
 from forest_ensys.api import deps
+from forest_ensys.database.session import SessionLocal
 from forest_ensys.core.timeseries_helpers import (
-    check_granularity_and_merge,
+    check_granularity_and_merge_multi,
     calculate_dynamic_network_fee,
 )
-from forest_ensys.core.optimization import optimize_dryers as optimize
 from forest_ensys.core.aas_helper import get_data_from_aas
+from forest_ensys.core.binary_decision import run_binary_decision
 from datetime import datetime
 
 import pandas as pd
 import numpy as np
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
@@ -89,138 +94,17 @@ def optimize_flexibility(
     """
     Binary decision problem to optimize the use of electric heating
     """
-    crud.flexible_power.delete_by_optimization_case_name(
-        db=db, optimization_case_name="binary_decision_problem"
-    )
-    crud.optimization_results.delete_by_optimization_case_name(
-        db=db, optimization_case_name="binary_decision_problem"
-    )
-    # Retrieve data from database
-    footprint_data = crud.footprint.get_multi_by_date_range(
-        db=db, start_date=start_date, end_date=end_date
-    )
-    heat_demand = crud.simulation_input_data.get_multi_by_date_range_and_name(
-        db=db,
-        start_date=start_date,
-        end_date=end_date,
-        name="flexible_device_demand",
-    )
-    if heat_demand is None:
-        raise HTTPException(
-            status_code=404, detail="No heat demand data found for the given date range"
-        )
-    price_data = crud.prices.get_multi_by_date_range_and_source(
+    return run_binary_decision(
         db=db,
         start_date=start_date,
         end_date=end_date,
-        source="smard",
-    )
-
-    # Merge dataframes and check granularity
-    merged_data = check_granularity_and_merge(
-        footprint_data, heat_demand[["timestamp", "value"]], method="sum"
-    )
-    merged_data = check_granularity_and_merge(
-        merged_data,
-        price_data[["timestamp", "price"]].rename(
-            columns={"price": "electricity_price"}
-        ),
-    )
-    merged_data["electricity_price"] = (
-        merged_data["electricity_price"] + electricity_network_fee
-    )
-
-    time_interval_hours = merged_data["timestamp"].diff().min().total_seconds() / 3600
-
-    # Decision based on electrical power (kW) at each timestamp
-    use_flexible_power = merged_data["co2"] < gas_emissions_factor
-    total_energy_demand = merged_data["value"].sum()
-    # Integrate flexible power used and gas usage over time (kWh)
-    electricity_used = np.where(
-        use_flexible_power, flexible_power * time_interval_hours, 0
-    ).sum()
-    gas_usage = total_energy_demand - electricity_used
-
-    # Flexible power time series (kWh per interval)
-    flexible_power_time_series = pd.DataFrame(
-        {
-            "timestamp": merged_data["timestamp"],
-            "electricity_used": np.where(use_flexible_power, flexible_power, 0),
-        }
-    )
-
-    emissions_gas_only = merged_data["value"].sum() * gas_emissions_factor * 1e-6
-
-    emissions_savings = (
-        np.where(
-            use_flexible_power,
-            (gas_emissions_factor - merged_data["co2"])
-            * flexible_power
-            * time_interval_hours,
-            0,
-        ).sum()
-    ) * 1e-6  # convert to tonnes
-
-    emissions_with_electric_heating = emissions_gas_only - emissions_savings
-
-    cost_gas_only = (
-        total_energy_demand * 1e-3 * cost_per_mwh_gas
-        + emissions_gas_only * 1e-6 * co2_price
-    )
-
-    cost_savings = emissions_savings * co2_price + (
-        np.where(
-            use_flexible_power,
-            (cost_per_mwh_gas - merged_data["electricity_price"])
-            * flexible_power
-            * time_interval_hours
-            * 1e-3,
-            0,
-        ).sum()
-    )
-
-    cost_with_electric_heating = cost_gas_only - cost_savings
-
-    flexible_power = pd.DataFrame(
-        {
-            "timestamp": flexible_power_time_series["timestamp"],
-            "electricity_used": flexible_power_time_series["electricity_used"],
-            "low_price_window": 0,
-            "optimization_case_name": "binary_decision_problem",
-        }
-    )
-
-    crud.flexible_power.create_multi(
-        db=db, obj_in=flexible_power.to_dict(orient="records")
+        flexible_power=flexible_power,
+        electricity_network_fee=electricity_network_fee,
+        gas_emissions_factor=gas_emissions_factor,
+        cost_per_mwh_gas=cost_per_mwh_gas,
+        co2_price=co2_price,
     )
 
-    optimization_results = {
-        "name": "binary_decision_problem",
-        "time_from": start_date,
-        "time_to": end_date,
-        "network_fee_type": "static",
-        "network_fee": 0.0,
-        "total_energy_demand": float(round(total_energy_demand, 2)),
-        "electricity_used": float(round(electricity_used, 2)),
-        "gas_usage": float(round(gas_usage, 2)),
-        "cost_savings": float(round(cost_savings, 2)),
-        "emissions_savings": float(round(emissions_savings, 2)),
-        "cost_gas_only": float(round(cost_gas_only, 2)),
-        "cost_with_electric_heating": float(round(cost_with_electric_heating, 2)),
-        "emissions_gas_only": float(round(emissions_gas_only, 2)),
-        "emissions_with_electric_heating": float(
-            round(emissions_with_electric_heating, 2)
-        ),
-        "full_load_hours": 0,
-        "full_load_hours_after_optimization": 0,
-        "mean_electricity_price_when_heating": float(
-            merged_data["electricity_price"][use_flexible_power].mean()
-        ),
-        "electric_heating_in_low_price_windows_ratio": 0,
-    }
-
-    return crud.optimization_results.create(db=db, obj_in=optimization_results)
-
 
 @router.post(
     "/optimize_flexibility_aas",
@@ -234,148 +118,197 @@ def optimize_flexibility_aas_data(
     Binary decision problem to optimize the use of electric heating
     """
     parameters = get_data_from_aas()
-    crud.flexible_power.delete_by_optimization_case_name(
-        db=db, optimization_case_name="binary_decision_problem"
-    )
-    flexible_power = int(parameters["powerMax"])
-    electricity_network_fee = int(parameters["electricityNetworkFee"])
-    gas_emissions_factor = 204
-    cost_per_mwh_gas = int(parameters["gasPrice"])
-    co2_price = int(parameters["co2Price"])
-    crud.optimization_results.delete_by_optimization_case_name(
-        db=db, optimization_case_name="binary_decision_problem"
-    )
-    # Retrieve data from database
-    footprint_data = crud.footprint.get_multi_by_date_range(
-        db=db, start_date=parameters["from"], end_date=parameters["until"]
-    )
-    heat_demand = crud.simulation_input_data.get_multi_by_date_range_and_name(
-        db=db,
-        start_date=parameters["from"],
-        end_date=parameters["until"],
-        name="flexible_device_demand",
-    )
-    if heat_demand is None:
-        raise HTTPException(
-            status_code=404, detail="No heat demand data found for the given date range"
-        )
-    price_data = crud.prices.get_multi_by_date_range_and_source(
+    return run_binary_decision(
         db=db,
         start_date=parameters["from"],
         end_date=parameters["until"],
-        source="smard",
+        flexible_power=int(parameters["powerMax"]),
+        electricity_network_fee=int(parameters["electricityNetworkFee"]),
+        gas_emissions_factor=204,
+        cost_per_mwh_gas=int(parameters["gasPrice"]),
+        co2_price=int(parameters["co2Price"]),
     )
 
-    # Merge dataframes and check granularity
-    merged_data = check_granularity_and_merge(
-        footprint_data, heat_demand[["timestamp", "value"]], method="sum"
-    )
-    merged_data = check_granularity_and_merge(
-        merged_data,
-        price_data[["timestamp", "price"]].rename(
-            columns={"price": "electricity_price"}
-        ),
-    )
-    merged_data["electricity_price"] = (
-        merged_data["electricity_price"] + electricity_network_fee
-    )
 
-    time_interval_hours = merged_data["timestamp"].diff().min().total_seconds() / 3600
+def read_in_own_session(read: Callable[..., Any], **kwargs) -> Any:
+    """
+    Run a CRUD read on its own session, so several reads can run in parallel threads.
+    """
+    with SessionLocal() as session:
+        return read(db=session, **kwargs)
 
-    # Decision based on electrical power (kW) at each timestamp
-    use_flexible_power = merged_data["co2"] < gas_emissions_factor
-    total_energy_demand = merged_data["value"].sum()
-    # Integrate flexible power used and gas usage over time (kWh)
-    electricity_used = np.where(
-        use_flexible_power, flexible_power * time_interval_hours, 0
-    ).sum()
-    gas_usage = total_energy_demand - electricity_used
 
-    # Flexible power time series (kWh per interval)
-    flexible_power_time_series = pd.DataFrame(
-        {
-            "timestamp": merged_data["timestamp"],
-            "electricity_used": np.where(use_flexible_power, flexible_power, 0),
-        }
+def summarize_dryer_schedule(
+    electricity_demand: np.ndarray,
+    window_type: np.ndarray,
+    optimized_power: np.ndarray,
+    electricity_price: np.ndarray,
+    time_interval_hours: float,
+) -> Tuple[float, float, float]:
+    """
+    Key figures of an optimized dryer schedule, computed on the raw arrays.
+    Returns the full load hours after optimization, the share of the total
+    electricity demand in low price windows and the mean electricity price
+    while heating electrically.
+    """
+    in_low_price_window = window_type == 1
+    # flexible power only adds to the peak outside of low price windows
+    demand = electricity_demand + optimized_power * (
+        time_interval_hours * ~in_low_price_window
     )
+    total_demand = demand.sum()
+    full_load_hours = total_demand * time_interval_hours / demand.max()
+    low_price_window_ratio = demand[in_low_price_window].sum() / total_demand
+    heating = optimized_power > 0
+    mean_electricity_price_when_heating = (
+        electricity_price[heating].mean() if heating.any() else float("nan")
+    )
+    return full_load_hours, low_price_window_ratio, mean_electricity_price_when_heating
 
-    emissions_gas_only = merged_data["value"].sum() * gas_emissions_factor * 1e-6
 
-    emissions_savings = (
-        np.where(
-            use_flexible_power,
-            (gas_emissions_factor - merged_data["co2"])
-            * flexible_power
-            * time_interval_hours,
-            0,
-        ).sum()
-    ) * 1e-6  # convert to tonnes
+def solve_and_store_dryers(
+    db: Session,
+    merged_data: pd.DataFrame,
+    *,
+    optimization_case_name: str,
+    start_date: datetime,
+    end_date: datetime,
+    flexible_power: int,
+    gas_emissions_factor: int,
+    co2_price: int,
+    ramp_up_rate: int,
+    ramp_down_rate: int,
+    minimum_runtime: int,
+    network_fee: str,
+    network_fee_value: float,
+    time_interval_hours: float,
+    full_load_hours: float,
+) -> None:
+    """
+    Solve the dryer optimization for the merged input data and store the results.
+    """
+    # Pyomo and gurobipy are only loaded once a dryer optimization actually runs
+    from forest_ensys.core.optimization import optimize_dryers as optimize
 
-    emissions_with_electric_heating = emissions_gas_only - emissions_savings
+    # Parameters
+    heat_demand_data = merged_data[
+        "flexible_device_demand"
+    ].to_numpy()  # Heat demand per interval (kW)
+    co2_electricity = merged_data["co2"].to_numpy()  # Electricity CO2 intensity (g/kWh)
+    price_electricity = merged_data[
+        "electricity_price"
+    ].to_numpy()  # Electricity price (€/MWh)
+    price_gas = merged_data["gas_price"].to_numpy()  # Gas price (€/MWh)
+    electricity_demand = merged_data["total_electricity_demand"].to_numpy()
+    window_type = merged_data["window_type"].to_numpy()
 
-    cost_gas_only = (
-        total_energy_demand * 1e-3 * cost_per_mwh_gas
-        + emissions_gas_only * 1e-6 * co2_price
+    optimization_results = optimize(
+        co2_data=co2_electricity,
+        heat_demand_data=heat_demand_data,
+        electricity_price_data=price_electricity,
+        electricity_demand=electricity_demand,
+        window_type=window_type,
+        electric_heating=flexible_power,
+        gas_emissions_factor=gas_emissions_factor,
+        gas_price_data=price_gas,
+        co2_price=co2_price,
+        ramp_up_rate=ramp_up_rate,
+        ramp_down_rate=ramp_down_rate,
+        minimum_runtime=minimum_runtime,
+        time_interval_hours=time_interval_hours,
     )
 
-    cost_savings = emissions_savings * co2_price + (
-        np.where(
-            use_flexible_power,
-            (cost_per_mwh_gas - merged_data["electricity_price"])
-            * flexible_power
-            * time_interval_hours
-            * 1e-3,
-            0,
-        ).sum()
+    optimized_power = optimization_results["optimized_results_df"][
+        "electric_power_used_kW"
+    ].to_numpy()
+    (
+        full_load_hours_after_optimization,
+        electric_heating_in_low_price_windows_ratio,
+        mean_electricity_price_when_heating,
+    ) = summarize_dryer_schedule(
+        electricity_demand,
+        window_type,
+        optimized_power,
+        price_electricity,
+        time_interval_hours,
+    )
+    logger.info(
+        "Full load hours after optimization: %s", full_load_hours_after_optimization
     )
 
-    cost_with_electric_heating = cost_gas_only - cost_savings
-
-    flexible_power = pd.DataFrame(
+    # Store optimized electric power usage in DB if needed:
+    timestamps = merged_data["timestamp"]
+    optimization_results["optimized_results_df"]["timestamp"] = timestamps
+    flexible_power = [
         {
-            "timestamp": flexible_power_time_series["timestamp"],
-            "electricity_used": flexible_power_time_series["electricity_used"],
-            "low_price_window": 0,
-            "optimization_case_name": "binary_decision_problem",
+            "timestamp": timestamp,
+            "electricity_used": electricity,
+            "low_price_window": low_price_window,
+            "optimization_case_name": optimization_case_name,
         }
-    )
+        for timestamp, electricity, low_price_window in zip(
+            timestamps.tolist(), optimized_power.tolist(), window_type.tolist()
+        )
+    ]
 
-    crud.flexible_power.create_multi(
-        db=db, obj_in=flexible_power.to_dict(orient="records")
+    optimization_results["name"] = optimization_case_name
+    optimization_results["time_from"] = start_date
+    optimization_results["time_to"] = end_date
+    optimization_results["network_fee_type"] = network_fee
+    optimization_results["network_fee"] = float(network_fee_value)
+    optimization_results["full_load_hours"] = float(full_load_hours)
+    optimization_results["full_load_hours_after_optimization"] = float(
+        full_load_hours_after_optimization
     )
-
-    optimization_results = {
-        "name": "binary_decision_problem",
-        "time_from": parameters["from"],
-        "time_to": parameters["until"],
-        "network_fee_type": "static",
-        "network_fee": 0.0,
-        "total_energy_demand": float(round(total_energy_demand, 2)),
-        "electricity_used": float(round(electricity_used, 2)),
-        "gas_usage": float(round(gas_usage, 2)),
-        "cost_savings": float(round(cost_savings, 2)),
-        "emissions_savings": float(round(emissions_savings, 2)),
-        "cost_gas_only": float(round(cost_gas_only, 2)),
-        "cost_with_electric_heating": float(round(cost_with_electric_heating, 2)),
-        "emissions_gas_only": float(round(emissions_gas_only, 2)),
-        "emissions_with_electric_heating": float(
-            round(emissions_with_electric_heating, 2)
-        ),
-        "full_load_hours": 0,
-        "full_load_hours_after_optimization": 0,
-        "mean_electricity_price_when_heating": float(
-            merged_data["electricity_price"][use_flexible_power].mean()
-        ),
-        "electric_heating_in_low_price_windows_ratio": 0,
-    }
-
-    return crud.optimization_results.create(db=db, obj_in=optimization_results)
+    optimization_results["mean_electricity_price_when_heating"] = float(
+        round(mean_electricity_price_when_heating, 2)
+    )
+    optimization_results["electric_heating_in_low_price_windows_ratio"] = float(
+        round(electric_heating_in_low_price_windows_ratio, 2)
+    )
+    crud.flexible_power.bulk_insert(db=db, rows=flexible_power)
+    crud.optimization_results.create(db=db, obj_in=optimization_results)
+
+
+def run_optimize_dryers_job(job_id: str, merged_data: pd.DataFrame, **kwargs) -> None:
+    """Background task wrapper - creates its own DB session"""
+    with SessionLocal() as db:
+        crud.job.set_status(db, id=job_id, status="running")
+        try:
+            solve_and_store_dryers(db, merged_data, **kwargs)
+        except Exception as e:
+            logger.exception("Dryer optimization failed")
+            db.rollback()
+            crud.job.set_status(
+                db, id=job_id, status="failed", result={"message": str(e)}
+            )
+            return
+        crud.job.set_status(
+            db,
+            id=job_id,
+            status="finished",
+            result={
+                "message": "Optimization finished successfully",
+                "optimization_case_name": kwargs["optimization_case_name"],
+            },
+        )
 
 
 @router.post(
     "/optimize_dryers",
-    response_model=schemas.OptimizationResult,
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
+        202: {
+            "description": "Optimization queued, poll /jobs/{job_id} for the result",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "accepted",
+                        "job_id": "3f2b9c0e4a5d4e6f8a7b6c5d4e3f2a1b",
+                    }
+                }
+            },
+        },
         404: {"description": "No data found for the given date range"},
         400: {"description": "Invalid Network Type"},
         501: {"description": "Not implemented yet"},
@@ -384,6 +317,7 @@ def optimize_flexibility_aas_data(
     },
 )
 def optimize_dryers(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     start_date: datetime = Query(
         "2024-01-01", description="Start date for the optimization period."
@@ -404,28 +338,33 @@ def optimize_dryers(
         description="Data source for gas prices. Constant uses a constant gas price for the whole period. You can upload PFCs or other forecasts under prices.",
     ),
     flexible_power: int = Query(
-        8000, description="The power of the flexible load in kW."
+        8000, ge=0, description="The power of the flexible load in kW."
     ),
     gas_emissions_factor: int = Query(
         204,
+        ge=0,
         description="The emissions factor for gas in g/kWh. It is around 200g/kWh for natural gas based on the Gross Calorific Value.",
     ),
     cost_per_mwh_gas: int = Query(
         60,
+        ge=0,
         description="The cost of gas in €/MWh. 60€/MWh was the average price for gas in Germany in 2024.",
     ),
     co2_price: int = Query(
         55,
+        ge=0,
         description="The price of CO2 in €/Tonne CO2. 55€/Tonne is the price for CO2 in Germany in 2025.",
     ),
     ramp_up_rate: int = Query(
-        6000, description="The ramp up rate of the flexible load in kW/h."
+        6000, ge=0, description="The ramp up rate of the flexible load in kW/h."
     ),
     ramp_down_rate: int = Query(
-        6000, description="The ramp down rate of the flexible load in kW/h."
+        6000, ge=0, description="The ramp down rate of the flexible load in kW/h."
     ),
     minimum_runtime: int = Query(
-        2, description="The minimum runtime of the flexible load in quarter hours."
+        2,
+        ge=0,
+        description="The minimum runtime of the flexible load in quarter hours.",
     ),
     network_fee: str = Query(
         "static",
@@ -434,6 +373,7 @@ def optimize_dryers(
     ),
     network_fee_value: float = Query(
         20.0,
+        ge=0,
         description="The network fee value in €/MWh.",
     ),
     relative_network_fee_reduction: float = Query(
@@ -452,30 +392,14 @@ def optimize_dryers(
         2,
         description="The window size for the dynamic network fee calculation in hours.",
     ),
-) -> schemas.OptimizationResult:
+) -> Text:
     """
-    Optimizes the use of electric heating using Pyomo.
+    Optimizes the use of electric heating using Pyomo in the background.
     """
     if start_date > end_date:
         raise HTTPException(
             status_code=400, detail="Start date must be before end date"
         )
-    if any(
-        value < 0 or not isinstance(value, (int, float)) or value is None
-        for value in [
-            flexible_power,
-            gas_emissions_factor,
-            cost_per_mwh_gas,
-            co2_price,
-            ramp_up_rate,
-            ramp_down_rate,
-            minimum_runtime,
-            network_fee_value,
-        ]
-    ):
-        raise HTTPException(
-            status_code=400, detail="All values must be positive numbers"
-        )
     if (
         crud.optimization_results.get(
             db=db, optimization_case_name=optimization_case_name
@@ -486,33 +410,64 @@ def optimize_dryers(
             status_code=400,
             detail="Optimization case already exists. Please delete it first or change the name.",
         )
-    footprint_data = crud.footprint.get_multi_by_date_range(
-        db=db, start_date=start_date, end_date=end_date
-    )
+    # the inputs are independent, so read them concurrently on separate connections
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        footprint_future = executor.submit(
+            read_in_own_session,
+            crud.footprint.get_multi_by_date_range,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        heat_demand_future = executor.submit(
+            read_in_own_session,
+            crud.simulation_input_data.get_multi_by_date_range_and_name,
+            start_date=start_date,
+            end_date=end_date,
+            name="flexible_device_demand",
+        )
+        total_electricity_demand_future = executor.submit(
+            read_in_own_session,
+            crud.simulation_input_data.get_multi_by_date_range_and_name,
+            start_date=start_date,
+            end_date=end_date,
+            name="total_electricity_demand",
+        )
+        electricity_price_future = executor.submit(
+            read_in_own_session,
+            crud.prices.get_multi_by_date_range_and_source,
+            start_date=start_date,
+            end_date=end_date,
+            source=electricity_price_data_source,
+            price_col="electricity_price",
+        )
+        gas_price_future = (
+            executor.submit(
+                read_in_own_session,
+                crud.prices.get_multi_by_date_range_and_source,
+                start_date=start_date,
+                end_date=end_date,
+                source=gas_price_data_source,
+                price_col="gas_price",
+            )
+            if gas_price_data_source != "constant"
+            else None
+        )
+        footprint_data = footprint_future.result()
+        heat_demand = heat_demand_future.result()
+        total_electricity_demand = total_electricity_demand_future.result()
+        electricity_price_data = electricity_price_future.result()
+        gas_price_data = gas_price_future.result() if gas_price_future else None
+
     if footprint_data is None:
         raise HTTPException(
             status_code=404, detail="No footprint data found for the given date range"
         )
-    heat_demand = crud.simulation_input_data.get_multi_by_date_range_and_name(
-        db=db,
-        start_date=start_date,
-        end_date=end_date,
-        name="flexible_device_demand",
-    )
     if heat_demand is None:
         raise HTTPException(
             status_code=404, detail="No heat demand data found for the given date range"
         )
     heat_demand.rename(columns={"value": heat_demand["name"][0]}, inplace=True)
     heat_demand.drop(columns=["name"], inplace=True)
-    total_electricity_demand = (
-        crud.simulation_input_data.get_multi_by_date_range_and_name(
-            db=db,
-            start_date=start_date,
-            end_date=end_date,
-            name="total_electricity_demand",
-        )
-    )
     if total_electricity_demand is None:
         raise HTTPException(
             status_code=404,
@@ -522,61 +477,49 @@ def optimize_dryers(
         columns={"value": total_electricity_demand["name"][0]}, inplace=True
     )
     total_electricity_demand.drop(columns=["name"], inplace=True)
-    electricity_price_data = crud.prices.get_multi_by_date_range_and_source(
-        db=db,
-        start_date=start_date,
-        end_date=end_date,
-        source=electricity_price_data_source,
-    )
     if electricity_price_data is None:
         raise HTTPException(
             status_code=404,
             detail="No price data found for the given date range and source",
         )
     if gas_price_data_source != "constant":
-        gas_price_data = crud.prices.get_multi_by_date_range_and_source(
-            db=db,
-            start_date=start_date,
-            end_date=end_date,
-            source=gas_price_data_source,
-        )
         if gas_price_data is None:
             raise HTTPException(
                 status_code=404,
                 detail="No gas price data found for the given date range and source",
             )
-        # as gas price data is only daily data, we interpolate it to 15 minutes
-        gas_price_data = (
-            gas_price_data.set_index("timestamp")
-            .resample("15min")
-            .ffill()
-            .reset_index()
+        # gas price data is usually daily data, so we interpolate it to 15 minutes
+        gas_timestamps = gas_price_data["timestamp"]
+        already_15min = len(gas_timestamps) > 1 and (
+            gas_timestamps.iat[1] - gas_timestamps.iat[0] == pd.Timedelta("15min")
         )
+        if not already_15min:
+            gas_price_data = (
+                gas_price_data.set_index("timestamp")
+                .asfreq("15min", method="ffill")
+                .reset_index()
+            )
     else:
         gas_price_data = pd.DataFrame(
             {
                 "timestamp": pd.date_range(
                     start=start_date, end=end_date, freq="15min"
                 ),
-                "price": cost_per_mwh_gas,
+                "gas_price": cost_per_mwh_gas,
                 "source": "constant",
             }
         )
 
     # Merge dataframes and check granularity
-    merged_data = check_granularity_and_merge(footprint_data, heat_demand, method="sum")
-    merged_data = check_granularity_and_merge(
-        merged_data, total_electricity_demand, method="sum"
-    )
-    merged_data = check_granularity_and_merge(
-        merged_data,
-        electricity_price_data[["timestamp", "price"]].rename(
-            columns={"price": "electricity_price"}
-        ),
-    )  # TODO make this better
-    merged_data = check_granularity_and_merge(
-        merged_data,
-        gas_price_data[["timestamp", "price"]].rename(columns={"price": "gas_price"}),
+    merged_data = check_granularity_and_merge_multi(
+        [
+            footprint_data,
+            heat_demand,
+            total_electricity_demand,
+            electricity_price_data[["timestamp", "electricity_price"]],
+            gas_price_data[["timestamp", "gas_price"]],
+        ],
+        methods=["sum", "sum", "sum", "mean", "mean"],
     )
     merged_data["gas_data_source"] = gas_price_data["source"]
     merged_data["electricity_data_source"] = electricity_price_data["source"]
@@ -597,11 +540,16 @@ def optimize_dryers(
             detail="Data does not cover the entire date range",
         )
     # we can also make full load hours a parameter. Then we would not need the time series anymore.
-    granularity_factor = 1 / (
-        merged_data["timestamp"].diff().min().total_seconds() / 3600
-    )
+    # merged series share one evenly spaced grid, so the first step is the interval
+    timestamps = merged_data["timestamp"]
+    if len(timestamps) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least two timestamps are needed to derive the time interval",
+        )
+    time_interval_hours = (timestamps.iat[1] - timestamps.iat[0]).total_seconds() / 3600
     full_load_hours = merged_data["total_electricity_demand"].sum() / (
-        merged_data["total_electricity_demand"].max() * granularity_factor
+        merged_data["total_electricity_demand"].max() / time_interval_hours
     )
 
     if network_fee == "static":
@@ -624,101 +572,26 @@ def optimize_dryers(
         )
     merged_data["gas_price"] = merged_data["gas_price"] + gas_network_fee
 
-    # Parameters
-    heat_demand_dict = merged_data[
-        "flexible_device_demand"
-    ].to_dict()  # Heat demand per interval (kW)
-    co2_electricity_dict = merged_data[
-        "co2"
-    ].to_dict()  # Electricity CO2 intensity (g/kWh)
-    price_electricity_dict = merged_data[
-        "electricity_price"
-    ].to_dict()  # Electricity price (€/MWh)
-    price_gas_dict = merged_data["gas_price"].to_dict()  # Gas price (€/MWh)
-    electricity_demand = merged_data["total_electricity_demand"].to_dict()
-    window_type = merged_data["window_type"].to_dict()
-
-    time_interval_hours = merged_data["timestamp"].diff().min().total_seconds() / 3600
-
-    optimization_results = optimize(
-        co2_data=co2_electricity_dict,
-        heat_demand_data=heat_demand_dict,
-        electricity_price_data=price_electricity_dict,
-        electricity_demand=electricity_demand,
-        window_type=window_type,
-        electric_heating=flexible_power,
+    job = crud.job.create(db=db, name="optimize_dryers")
+    background_tasks.add_task(
+        run_optimize_dryers_job,
+        job.id,
+        merged_data,
+        optimization_case_name=optimization_case_name,
+        start_date=start_date,
+        end_date=end_date,
+        flexible_power=flexible_power,
         gas_emissions_factor=gas_emissions_factor,
-        gas_price_data=price_gas_dict,
         co2_price=co2_price,
         ramp_up_rate=ramp_up_rate,
         ramp_down_rate=ramp_down_rate,
         minimum_runtime=minimum_runtime,
+        network_fee=network_fee,
+        network_fee_value=network_fee_value,
         time_interval_hours=time_interval_hours,
+        full_load_hours=full_load_hours,
     )
-
-    merged_data["total_electricity_demand_with_flexible_power"] = np.where(
-        merged_data["window_type"] != 1,
-        merged_data["total_electricity_demand"]
-        + (
-            optimization_results["optimized_results_df"]["electric_power_used_kW"]
-            * time_interval_hours
-        ),
-        merged_data["total_electricity_demand"],
-    )
-    full_load_hours_after_optimization = merged_data[
-        "total_electricity_demand_with_flexible_power"
-    ].sum() / (
-        merged_data["total_electricity_demand_with_flexible_power"].max()
-        * granularity_factor
-    )
-    print("Full Load Hours After Optimization: ", full_load_hours_after_optimization)
-
-    electric_heating_in_low_price_windows = merged_data[
-        merged_data["window_type"] == 1
-    ]["total_electricity_demand_with_flexible_power"].sum()
-    electric_heating_in_low_price_windows_ratio = (
-        electric_heating_in_low_price_windows
-        / (merged_data["total_electricity_demand_with_flexible_power"].sum())
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"status": "accepted", "job_id": job.id},
     )
-    mean_electricity_price_when_heating = np.nanmean(
-        np.where(
-            optimization_results["optimized_results_df"]["electric_power_used_kW"] > 0,
-            merged_data["electricity_price"],
-            np.nan,
-        )
-    )
-    # Store optimized electric power usage in DB if needed:
-    optimization_results["optimized_results_df"]["timestamp"] = merged_data["timestamp"]
-    flexible_power = pd.DataFrame(
-        {
-            "timestamp": merged_data["timestamp"],
-            "electricity_used": optimization_results["optimized_results_df"][
-                "electric_power_used_kW"
-            ],
-            "low_price_window": merged_data["window_type"],
-            "optimization_case_name": optimization_case_name,
-        }
-    )
-
-    optimization_results["name"] = optimization_case_name
-    optimization_results["time_from"] = start_date
-    optimization_results["time_to"] = end_date
-    optimization_results["network_fee_type"] = network_fee
-    optimization_results["network_fee"] = float(network_fee_value)
-    optimization_results["full_load_hours"] = float(full_load_hours)
-    optimization_results["full_load_hours_after_optimization"] = float(
-        full_load_hours_after_optimization
-    )
-    optimization_results["mean_electricity_price_when_heating"] = float(
-        round(mean_electricity_price_when_heating, 2)
-    )
-    optimization_results["electric_heating_in_low_price_windows_ratio"] = float(
-        round(electric_heating_in_low_price_windows_ratio, 2)
-    )
-    try:
-        crud.flexible_power.create_multi(
-            db=db, obj_in=flexible_power.to_dict(orient="records")
-        )
-        return crud.optimization_results.create(db=db, obj_in=optimization_results)
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
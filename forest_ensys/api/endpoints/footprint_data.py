@@ -2,27 +2,15 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import List, Text
+from datetime import datetime
+from typing import List, Optional, Text
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from forest_ensys import crud, model, schemas
+from forest_ensys import crud, schemas
 from forest_ensys.api import deps
 
-router = APIRouter()
-
-grid_to_factors = {
-    "Biomasse": "biomass",
-    "Wasserkraft": "hydro",
-    "Wind Offshore": "wind",
-    "Wind Onshore": "wind",
-    "Photovoltaik": "solar",
-    "Braunkohle": "coal",
-    "Steinkohle": "coal",
-    "Erdgas": "gas",
-    "Sonstige Konventionelle": "gas",
-    "Sonstige Erneuerbare": "solar",
-    "Pumpspeicher": "hydro",
-}
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.delete(
@@ -48,20 +36,10 @@ def delete_footprint_data(db: Session = Depends(deps.get_db)) -> Text:
     )
 
 
-def update_footprint_data(db: Session = Depends(deps.get_db)):
-    grid = crud.grid.get_average_co2_by_commodity(db=db)
-    footprint_data = []
-    for row in grid:
-        # this means we have missing data for this 15 mins and the co2 is zero
-        if row[1] == 0:
-            continue
-        footprint_data.append(
-            model.Footprint(
-                timestamp=row[0],
-                co2=row[1] / (row[2] * 1000),
-            )
-        )
-    crud.footprint.create_multi(db=db, obj_in=footprint_data)
+def update_footprint_data(
+    db: Session = Depends(deps.get_db), since: Optional[datetime] = None
+):
+    crud.footprint.recompute_from_grid(db=db, since=since)
 
 
 @router.get("/", response_model=List[schemas.Footprint])
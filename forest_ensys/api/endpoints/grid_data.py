@@ -2,59 +2,40 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
 from typing import List, Text
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from forest_ensys import crud, schemas
 from forest_ensys.api import deps
 from forest_ensys.api.endpoints import footprint_data, emissions_data
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from forest_ensys.core import crawlers
+from forest_ensys.core.constants import (
+    COMMODITIES,
+    DAY_AHEAD_COMMODITY_ID,
+    FACTOR_BY_ID,
+)
+from forest_ensys.database.session import SessionLocal
 import pandas as pd
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from sqlalchemy.exc import SQLAlchemyError
 
 # Setup logging
 logger = logging.getLogger(__name__)
-router = APIRouter()
-
-keys = {
-    # 411: 'Prognostizierter Stromverbrauch',
-    # 410: 'Realisierter Stromverbrauch',
-    4169: "Preis",
-    4066: "Biomasse",
-    1226: "Wasserkraft",
-    1225: "Wind Offshore",
-    4067: "Wind Onshore",
-    4068: "Photovoltaik",
-    1228: "Sonstige Erneuerbare",
-    1223: "Braunkohle",
-    4071: "Erdgas",
-    4070: "Pumpspeicher",
-    1227: "Sonstige Konventionelle",
-    4069: "Steinkohle",
-    # 5097: 'Prognostizierte Erzeugung PV und Wind Day-Ahead'
-}
-
-grid_to_factors = {
-    "Biomasse": "biomass",
-    "Wasserkraft": "hydro",
-    "Wind Offshore": "wind",
-    "Wind Onshore": "wind",
-    "Photovoltaik": "solar",
-    "Braunkohle": "coal",
-    "Steinkohle": "coal",
-    "Erdgas": "gas",
-    "Sonstige Konventionelle": "gas",
-    "Sonstige Erneuerbare": "solar",
-    "Pumpspeicher": "hydro",
-}
-
-DAY_AHEAD_COMMODITY_ID = 4169
+router = APIRouter(default_response_class=ORJSONResponse)
+
+_PRODUCTION_MODES = sorted(set(FACTOR_BY_ID.values()))
+
+# (emissions table version, factors by commodity id) of the last factor lookup
+_emissions_factors_cache: Optional[Tuple[str, Dict[int, float]]] = None
+_emissions_factors_lock = Lock()
 
 @router.delete(
     "/",
@@ -84,12 +65,12 @@ def get_all_grid_data(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-) -> List[schemas.Grid]:
+) -> ORJSONResponse:
     """
     Retrieve all grid data
     """
-    grid_data = crud.grid.get_multi(db=db, skip=skip, limit=limit)
-    return grid_data
+    grid_data = crud.grid.get_multi_as_dicts(db=db, skip=skip, limit=limit)
+    return ORJSONResponse(grid_data)
 
 def calculate_start_timestamps(
     latest: Optional[datetime], default_start_date: str
@@ -104,257 +85,336 @@ def calculate_start_timestamps(
         latest = pd.to_datetime(default_start_date)
         latest = latest.replace(tzinfo=None)  # Ensure naive for processing
 
-    # SMARD data starts Sunday 22:00 UTC (or 21:45 in some cases)
-    # If latest is not Sunday after 22:00, backtrack to last Sunday 22:00
-    if latest.weekday() != 6 or (
-        latest.hour < 22 or (latest.hour == 21 and latest.minute < 45)
-    ):
-        days_since_sunday = (latest.weekday() + 1) % 7
-        last_sunday = latest - timedelta(days=days_since_sunday)
-        last_sunday = last_sunday.replace(hour=22, minute=0, second=0, microsecond=0)
-        logger.info(
-            f"Adjusting start date from {latest} to last Sunday 22:00: {last_sunday}"
-        )
-        latest = last_sunday
-
-    # Handle 21:45 vs 22:45 cases (SMARD API inconsistency)
-    if latest.hour == 21 and latest.minute == 45:
-        timestamp1 = latest.replace(hour=22, minute=0, second=0, microsecond=0)
-        timestamp2 = latest.replace(hour=23, minute=0, second=0, microsecond=0)
-    else:
-        timestamp1 = latest.replace(hour=23, minute=0, second=0, microsecond=0)
-        timestamp2 = latest.replace(hour=22, minute=0, second=0, microsecond=0)
+    # SMARD weeks start on Sunday and the file is keyed either 23:00 or 22:00,
+    # so both candidates of the most recent Sunday (or the day itself) are returned
+    sunday = (latest - timedelta(days=(latest.weekday() + 1) % 7)).replace(
+        minute=0, second=0, microsecond=0
+    )
+    timestamp1 = sunday.replace(hour=23)
+    timestamp2 = sunday.replace(hour=22)
 
     return timestamp1, timestamp2
 
 
+@lru_cache(maxsize=64)
+def start_timestamps_unix(
+    latest: Optional[datetime], default_start_date: str
+) -> tuple[int, int]:
+    """
+    calculate_start_timestamps as Unix milliseconds for the SMARD API.
+    Cached, since most commodities share the same latest timestamp.
+    """
+    timestamp1, timestamp2 = calculate_start_timestamps(latest, default_start_date)
+    return int(timestamp1.timestamp() * 1000), int(timestamp2.timestamp() * 1000)
+
+
 def is_commodity_up_to_date(
-    commodity_id: int, latest_timestamp: datetime, staleness_hours: int = 6
+    commodity_id: int,
+    latest_timestamp: datetime,
+    staleness_hours: int = 6,
+    now: Optional[datetime] = None,
 ) -> bool:
     """
     Check if commodity data is up-to-date.
 
     Day-ahead prices (4169): Available 24h in advance, check if we have tomorrow's data
     Real-time data: Check if within last N hours
+    `now` can be passed in when checking many commodities against the same time.
     """
-    now = datetime.now(tz=latest_timestamp.tzinfo)
+    if now is None:
+        now = datetime.now(tz=latest_timestamp.tzinfo)
 
     if commodity_id == DAY_AHEAD_COMMODITY_ID:
         # For day-ahead: Check if we have data for tomorrow
         # Day-ahead published around 13:00 CET daily
         if latest_timestamp.date() > now.date():
-            logger.info(
-                f"Commodity {commodity_id} up-to-date (has future data: {latest_timestamp.date()})"
+            logger.debug(
+                "Commodity %s up-to-date (has future data: %s)",
+                commodity_id,
+                latest_timestamp.date(),
             )
             return True
         # If before 14:00 CET and we have today's data, consider it current
         if now.hour < 14 and latest_timestamp.date() >= now.date():
-            logger.info(
-                f"Commodity {commodity_id} up-to-date (before 14:00, has today's data)"
+            logger.debug(
+                "Commodity %s up-to-date (before 14:00, has today's data)", commodity_id
             )
             return True
     else:
         # For real-time data: Check if within staleness window
         if latest_timestamp > now - timedelta(hours=staleness_hours):
-            logger.info(
-                f"Commodity {commodity_id} up-to-date (within {staleness_hours}h)"
+            logger.debug(
+                "Commodity %s up-to-date (within %sh)", commodity_id, staleness_hours
             )
             return True
 
     return False
 
 
-def update_grid_data_logic(
-    db: Session, keys: Dict[int, str], default_start_date: str = "12-31-2023 22:00:00"
-) -> Dict[str, Any]:
-    """
-    Core logic for updating grid data (separated from endpoint).
-    This can be called from an endpoint, background task, or scheduled job.
-    """
+def fetch_emissions_factors(db: Session) -> Dict[int, float]:
+    """Emissions factors per commodity, failures are reported as 502."""
     try:
-        latest_emissions_factors = get_latest_emissions_factors(db=db)
+        return get_latest_emissions_factors(db=db)
     except SQLAlchemyError as e:
-        logger.error(f"Database error retrieving emissions factors: {e}")
+        logger.error("Database error retrieving emissions factors: %s", e)
         raise HTTPException(
             status_code=502, detail="Could not retrieve emissions data from database"
         )
     except Exception as e:
-        logger.error(f"Unexpected error retrieving emissions factors: {e}")
+        logger.error("Unexpected error retrieving emissions factors: %s", e)
         raise HTTPException(
             status_code=502,
             detail="Could not retrieve emissions data. Server probably offline",
         )
 
+
+def update_grid_data_logic(
+    db: Session,
+    commodities: Tuple[Tuple[int, str, Optional[str]], ...] = COMMODITIES,
+    default_start_date: str = "12-31-2023 22:00:00",
+) -> Dict[str, Any]:
+    """
+    Core logic for updating grid data (separated from endpoint).
+    This can be called from an endpoint, background task, or scheduled job.
+    """
+    # only needed once something is outdated, a run with fresh data skips them
+    latest_emissions_factors = None
     commodities_updated = {}
-    max_iterations = 10  # Safety limit instead of infinite loop
+    # one reference time for all freshness checks of this update
+    now = datetime.now(tz=timezone.utc)
+    earliest_stored = None
+    # SMARD serves one week per request, so a commodity that stored new rows needs
+    # another pass for the following week; every other commodity is settled after
+    # its first pass. The limit only bounds how many weeks one call catches up.
+    max_iterations = 10
     iteration = 0
 
     while iteration < max_iterations:
         iteration += 1
-        logger.info(f"Update iteration {iteration}/{max_iterations}")
-
-        for commodity_id, commodity_name in keys.items():
-            # Get latest timestamp for this commodity
-            try:
-                if commodity_id != DAY_AHEAD_COMMODITY_ID:
-                    latest = crud.grid.get_latest_for_commodity(
-                        db=db, commodity_id=commodity_id
-                    )
-                else:
-                    latest = crud.prices.get_latest(db=db)
-            except SQLAlchemyError as e:
-                logger.error(f"Database error for commodity {commodity_id}: {e}")
+        logger.info("Update iteration %s/%s", iteration, max_iterations)
+
+        # Get latest timestamp of every commodity at once
+        try:
+            latest_by_commodity = crud.grid.get_latest_timestamps_by_commodity(db=db)
+            latest_price = crud.prices.get_latest_timestamp(db=db, source="smard")
+        except SQLAlchemyError as e:
+            # retrying the same query right away will not help, report as pending
+            logger.error("Database error reading latest timestamps: %s", e)
+            break
+        if latest_price:
+            latest_by_commodity[DAY_AHEAD_COMMODITY_ID] = latest_price
+
+        # (commodity_id, commodity_name, start_unix, second_start_unix)
+        outdated = []
+        latest_in_db_by_commodity = {}
+        for commodity_id, commodity_name, _ in commodities:
+            # fresh, or nothing new at SMARD, in an earlier pass
+            if commodity_id in commodities_updated:
                 continue
-
+            latest = latest_by_commodity.get(commodity_id)
             latest_in_db = None
-            latest_dt = None
 
             try:
                 if latest:
-                    latest_dt = pd.to_datetime(latest.timestamp)
-                    # Ensure timezone-aware
-                    if latest_dt.tzinfo is None:
-                        latest_in_db = latest_dt.tz_localize("UTC")
-                    else:
-                        latest_in_db = latest_dt
-
-                    logger.info(
-                        f"Latest in DB for commodity {commodity_id}: {latest_in_db}"
+                    # stored naive in UTC, make it timezone-aware without pandas
+                    latest_in_db = (
+                        latest
+                        if latest.tzinfo
+                        else latest.replace(tzinfo=timezone.utc)
+                    )
+
+                    logger.debug(
+                        "Latest in DB for commodity %s: %s", commodity_id, latest_in_db
                     )
 
                     # Check if this commodity is up-to-date
-                    if is_commodity_up_to_date(commodity_id, latest_in_db):
+                    if is_commodity_up_to_date(commodity_id, latest_in_db, now=now):
                         commodities_updated[commodity_id] = True
                         continue  # Skip to next commodity
 
                 # Calculate start timestamps (handles SMARD quirks)
-                timestamp1, timestamp2 = calculate_start_timestamps(
-                    latest_dt, default_start_date
+                start_date_unix, second_start_date_unix = start_timestamps_unix(
+                    latest_in_db, default_start_date
                 )
 
             except (ValueError, AttributeError) as e:
                 logger.warning(
-                    f"Using default start date for commodity {commodity_id}: {e}"
+                    "Using default start date for commodity %s: %s", commodity_id, e
                 )
-                timestamp1, timestamp2 = calculate_start_timestamps(
+                start_date_unix, second_start_date_unix = start_timestamps_unix(
                     None, default_start_date
                 )
 
-            # Convert to Unix milliseconds
-            start_date_unix = int(timestamp1.timestamp() * 1000)
-            second_start_date_unix = int(timestamp2.timestamp() * 1000)
-
-            # Fetch data from SMARD API
-            data_for_commodity = crawlers.get_data_per_commodity(
-                commodity_id, commodity_name, start_date_unix, second_start_date_unix
+            outdated.append(
+                (commodity_id, commodity_name, start_date_unix, second_start_date_unix)
             )
+            latest_in_db_by_commodity[commodity_id] = latest_in_db
+
+        # Fetch data from SMARD API, the requests are independent and run in parallel
+        fetched = []
+        if outdated:
+            if latest_emissions_factors is None:
+                latest_emissions_factors = fetch_emissions_factors(db)
+            with ThreadPoolExecutor(max_workers=len(outdated)) as executor:
+                fetched = list(
+                    executor.map(
+                        lambda commodity: crawlers.get_data_per_commodity(*commodity),
+                        outdated,
+                    )
+                )
 
+        grid_batches = []
+        grid_batch_ids = []
+        for (commodity_id, *_), data_for_commodity in zip(outdated, fetched):
             if data_for_commodity.empty:
-                logger.warning(f"No new data available for commodity {commodity_id}")
+                logger.warning("No new data available for commodity %s", commodity_id)
                 # Mark as updated to avoid infinite retries
                 commodities_updated[commodity_id] = True
                 continue
 
-            # Remove duplicate timestamps
-            data_for_commodity = data_for_commodity[
-                ~data_for_commodity.index.duplicated(keep="first")
-            ]
-
-            # Filter out already-stored data
+            # Drop duplicate and already stored timestamps with a single mask, the
+            # SMARD week mostly overlaps what is in the database
+            timestamps = data_for_commodity["timestamp"]
+            keep = ~timestamps.duplicated(keep="first")
+            latest_in_db = latest_in_db_by_commodity[commodity_id]
             if latest_in_db is not None:
-                data_for_commodity = data_for_commodity[
-                    data_for_commodity["timestamp"] > latest_in_db
-                ]
+                keep &= timestamps > latest_in_db
+            data_for_commodity = data_for_commodity.loc[keep]
 
             if data_for_commodity.empty:
-                logger.info(f"All data already in DB for commodity {commodity_id}")
+                logger.info("All data already in DB for commodity %s", commodity_id)
                 commodities_updated[commodity_id] = True
                 continue
 
-            # Store in database
-            try:
-                if commodity_id == DAY_AHEAD_COMMODITY_ID:
-                    data_for_commodity = data_for_commodity.rename(
-                        columns={"mwh": "price"}
-                    )
-                    data_for_commodity["source"] = "smard"
-                    data_for_commodity = data_for_commodity.drop(
-                        columns=["commodity_id", "commodity_name"], errors="ignore"
-                    )
-                    crud.prices.create_multi(
-                        db, obj_in=data_for_commodity.to_dict(orient="records")
-                    )
-                else:
-                    data_for_commodity["co2"] = (
-                        data_for_commodity["mwh"]
-                        * latest_emissions_factors.get(commodity_name, 0)
-                        * 1000
-                    )
-                    crud.grid.create_multi(
-                        db, obj_in=data_for_commodity.to_dict(orient="records")
+            if commodity_id != DAY_AHEAD_COMMODITY_ID:
+                # one float64 ufunc over the whole column
+                mwh = data_for_commodity["mwh"].astype("float64", copy=False)
+                grid_batches.append(
+                    data_for_commodity.assign(
+                        co2=mwh * (latest_emissions_factors.get(commodity_id, 0) * 1000)
                     )
+                )
+                grid_batch_ids.append(commodity_id)
+                continue
 
-                logger.info(
-                    f"Stored {len(data_for_commodity)} records for commodity {commodity_id}"
+            # Store in database, rows stored in the meantime are skipped by the insert
+            try:
+                data_for_commodity = data_for_commodity.rename(columns={"mwh": "price"})
+                data_for_commodity["source"] = "smard"
+                data_for_commodity = data_for_commodity.drop(
+                    columns=["commodity_id", "commodity_name"], errors="ignore"
                 )
+                stored = crud.prices.create_multi(db, obj_in=data_for_commodity)
             except SQLAlchemyError as e:
-                logger.error(f"Database error storing commodity {commodity_id}: {e}")
+                logger.error("Database error storing commodity %s: %s", commodity_id, e)
                 raise HTTPException(
                     status_code=500,
                     detail=f"Failed to store data for commodity {commodity_id}",
                 )
+            if not stored:
+                logger.info("All data already in DB for commodity %s", commodity_id)
+                commodities_updated[commodity_id] = True
+                continue
+            logger.info("Stored %s records for commodity %s", stored, commodity_id)
+
+        # Store the grid rows of all commodities of this pass in a single write
+        if grid_batches:
+            new_grid_data = pd.concat(grid_batches, ignore_index=True)
+            try:
+                stored = crud.grid.create_multi(db, obj_in=new_grid_data)
+            except SQLAlchemyError as e:
+                logger.error("Database error storing grid data: %s", e)
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to store data for commodities {grid_batch_ids}",
+                )
+            if stored:
+                first_fetched = new_grid_data["timestamp"].min()
+                if earliest_stored is None or first_fetched < earliest_stored:
+                    earliest_stored = first_fetched
+                logger.info(
+                    "Stored %s records for commodities %s", stored, grid_batch_ids
+                )
+            else:
+                # everything was stored in the meantime
+                logger.info("All data already in DB for commodities %s", grid_batch_ids)
+                commodities_updated.update(dict.fromkeys(grid_batch_ids, True))
 
         # Check if all commodities are updated
-        if len(commodities_updated) == len(keys):
+        if len(commodities_updated) == len(commodities):
             logger.info("All commodities up-to-date")
             break
 
-    # Update footprint data
-    try:
-        footprint_data.update_footprint_data(db)
-    except Exception as e:
-        logger.error(f"Error updating footprint data: {e}")
-        # Don't fail the whole operation for this
+    # Update footprint data for the new grid timestamps, if there are any
+    if earliest_stored is not None:
+        try:
+            footprint_data.update_footprint_data(
+                db, since=earliest_stored.to_pydatetime()
+            )
+        except Exception as e:
+            logger.error("Error updating footprint data: %s", e)
+            # Don't fail the whole operation for this
 
     return {
         "commodities_updated": len(commodities_updated),
-        "total_commodities": len(keys),
+        "total_commodities": len(commodities),
         "iterations": iteration,
+        "pending": [
+            commodity_id
+            for commodity_id, _, _ in commodities
+            if commodity_id not in commodities_updated
+        ],
     }
 
 
+def run_grid_update_job(job_id: str, default_start_date: str) -> None:
+    """Background task wrapper - creates its own DB session"""
+    with SessionLocal() as db:
+        crud.job.set_status(db, id=job_id, status="running")
+        try:
+            result = update_grid_data_logic(db, default_start_date=default_start_date)
+        except HTTPException as e:
+            crud.job.set_status(
+                db, id=job_id, status="failed", result={"message": e.detail}
+            )
+            return
+        except Exception as e:
+            logger.exception("Unexpected error during grid data update")
+            db.rollback()
+            crud.job.set_status(
+                db,
+                id=job_id,
+                status="failed",
+                result={"message": f"Grid data update failed: {str(e)}"},
+            )
+            return
+        crud.job.set_status(
+            db,
+            id=job_id,
+            status="finished",
+            result={"message": "Grid data updated successfully", **result},
+        )
+
+
 @router.post(
     "/update",
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
-        200: {
-            "description": "Successful Response",
-            "content": {
-                "application/json": {
-                    "example": {"message": "Grid data updated successfully"}
-                }
-            },
-        },
-        502: {
-            "description": "Server Error",
+        202: {
+            "description": "Update queued, poll /jobs/{job_id} for the result",
             "content": {
                 "application/json": {
                     "example": {
-                        "message": "Could not retrieve emissions data. Server probably offline"
+                        "status": "accepted",
+                        "job_id": "3f2b9c0e4a5d4e6f8a7b6c5d4e3f2a1b",
                     }
                 }
             },
         },
-        404: {
-            "description": "Not Found",
-            "content": {
-                "application/json": {
-                    "example": {"message": "Website did not return any data."}
-                }
-            },
-        },
     },
 )
 def update_recent_grid_data(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     default_start_date: str = Query(
         "12-31-2023 22:00:00",
@@ -362,47 +422,46 @@ def update_recent_grid_data(
     ),
 ):
     """
-    Trigger grid data update.
+    Trigger grid data update in the background.
 
     """
-    try:
-        result = update_grid_data_logic(db, keys, default_start_date)
-
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status": "success",
-                "message": "Grid data updated successfully",
-                **result,
-            },
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.exception("Unexpected error during grid data update")
-        raise HTTPException(
-            status_code=500, detail=f"Grid data update failed: {str(e)}"
-        )
-
-
-def get_latest_emissions_factors(db: Session) -> dict:
-    emissions = {}
-    if not crud.emissions.get_multi(db=db):
-        print("Emissions data seems empty, trying to crawl")
-        emissions_data.update_emissions_data(db=db)
-
-    for commodity_id, commodity_name in keys.items():
-        if commodity_id == 4169:
-            continue
-        print(
-            f"getting latest emission factor for {commodity_name} and {grid_to_factors[commodity_name]}"
-        )
-        specific_emission = crud.emissions.get_specific_emissions(
+    job = crud.job.create(db=db, name="grid_update")
+    background_tasks.add_task(run_grid_update_job, job.id, default_start_date)
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"status": "accepted", "job_id": job.id},
+    )
+
+
+def get_latest_emissions_factors(db: Session) -> Dict[int, float]:
+    global _emissions_factors_cache
+    # one cheap version query decides whether the cached factors are still current
+    version = crud.emissions.get_version(db=db)
+    with _emissions_factors_lock:
+        if _emissions_factors_cache and _emissions_factors_cache[0] == version:
+            return dict(_emissions_factors_cache[1])
+    # the table changed, possibly in another worker: drop the cached lookups
+    crud.emissions.clear_cache()
+    latest_factors = crud.emissions.get_latest_values_by_production_mode(
+        db=db,
+        zone_key="DE",
+        emission_type="direct",
+        production_modes=_PRODUCTION_MODES,
+    )
+    if not latest_factors:
+        logger.info("Emissions data seems empty, trying to crawl")
+        emissions_data.crawl_and_store_emissions_data(db=db)
+        version = crud.emissions.get_version(db=db)
+        latest_factors = crud.emissions.get_latest_values_by_production_mode(
             db=db,
             zone_key="DE",
             emission_type="direct",
-            production_mode=grid_to_factors[commodity_name],
+            production_modes=_PRODUCTION_MODES,
         )
-        print(specific_emission)
-        emissions[commodity_name] = specific_emission.value
-    return emissions
+    factors = {
+        commodity_id: latest_factors[production_mode]
+        for commodity_id, production_mode in FACTOR_BY_ID.items()
+    }
+    with _emissions_factors_lock:
+        _emissions_factors_cache = (version, factors)
+    return dict(factors)
@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from forest_ensys import crud, schemas
+from forest_ensys.api import deps
+
+router = APIRouter()
+
+
+@router.get(
+    "/{job_id}",
+    response_model=schemas.Job,
+    responses={404: {"description": "Job not found"}},
+)
+def get_job(job_id: str, db: Session = Depends(deps.get_db)) -> schemas.Job:
+    """
+    Retrieve the status of a background job
+    """
+    job = crud.job.get(db=db, id=job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found!"
+        )
+    return job
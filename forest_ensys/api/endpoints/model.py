@@ -10,7 +10,6 @@ from sqlalchemy.orm import Session
 
 from forest_ensys import crud, schemas
 from forest_ensys.api import deps
-from forest_ensys.core.calliope_model import generate_calliope_model
 import pandas as pd
 import json
 
@@ -67,6 +66,8 @@ def optimize_model_by_id(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Model {model_id} not found!"
         )
+    from forest_ensys.core.calliope_model import generate_calliope_model
+
     calliope_model = generate_calliope_model(model.model, electricity_data, heat_data)
     calliope_model.build()
     calliope_model.solve()
@@ -85,24 +86,27 @@ def optimize_model_by_name(
     Optimize the model by name
     """
     model = crud.model.get_by_name(db=db, name=model_name)
+    # checked before any time series is read, the reads are the expensive part
+    if model is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model {model_name} not found!",
+        )
     electricity_data = crud.process_electricity.get_from_start_date(
         db=db, start_date=start_date
     )
-    electricity_data_df = pd.read_sql(
-        electricity_data.statement, electricity_data.session.connection()
-    )
-    heat_data = crud.process_heat.get_from_start_date(db=db, start_date=start_date)
-    heat_data_df = pd.read_sql(heat_data.statement, heat_data.session.connection())
-    if electricity_data_df.empty or heat_data_df.empty:
+    electricity_data_df = pd.read_sql(electricity_data.statement, db.connection())
+    heat_data_df = None
+    if not electricity_data_df.empty:
+        heat_data = crud.process_heat.get_from_start_date(db=db, start_date=start_date)
+        heat_data_df = pd.read_sql(heat_data.statement, db.connection())
+    if heat_data_df is None or heat_data_df.empty:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Electricity data or heat data not found for model {model_name}!",
         )
-    if model is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Model {model_name} not found!",
-        )
+    from forest_ensys.core.calliope_model import generate_calliope_model
+
     calliope_model = generate_calliope_model(
         model.model, electricity_data_df, heat_data_df
     )
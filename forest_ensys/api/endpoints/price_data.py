@@ -2,7 +2,9 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import List
+import csv
+from itertools import chain
+from typing import Iterator, List
 
 from fastapi import (
     APIRouter,
@@ -15,17 +17,50 @@ from fastapi import (
     Form,
 )
 from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from forest_ensys import crud, schemas
+from forest_ensys import crud, model, schemas
 from forest_ensys.api import deps
-from forest_ensys.core.timeseries_helpers import ensure_consistent_granularity
+from forest_ensys.database.session import engine
+from forest_ensys.core.timeseries_helpers import (
+    ensure_consistent_granularity,
+    read_csv_columns,
+)
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 from io import StringIO
 
 router = APIRouter()
 
 
+def stream_price_csv(
+    start_date: datetime, end_date: datetime, source: str
+) -> Iterator[str]:
+    """
+    Yield the prices of a source as CSV, fetched through a server-side cursor.
+    Nothing is yielded when there are no prices in the range.
+    """
+    statement = select(
+        model.Prices.timestamp, model.Prices.source, model.Prices.price
+    ).where(
+        model.Prices.timestamp.between(start_date, end_date),
+        model.Prices.source == source,
+    )
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["timestamp", "source", "price"])
+    # named (server-side) cursors need a transaction, so leave autocommit here
+    with engine.connect().execution_options(
+        isolation_level="READ COMMITTED", stream_results=True, yield_per=5000
+    ) as connection:
+        for partition in connection.execute(statement).partitions():
+            writer.writerows(partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
 @router.get("/", response_model=List[schemas.Prices])
 def get_all_price_data(
     db: Session = Depends(deps.get_db),
@@ -78,18 +113,14 @@ def download_price_csv(
     db: Session = Depends(deps.get_db),
 ):
     try:
-        data_df = crud.prices.get_multi_by_date_range_and_source(
-            db=db, start_date=start_date, end_date=end_date, source=source
-        )
-        if data_df is None:
+        chunks = stream_price_csv(start_date, end_date, source)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
             raise HTTPException(
                 status_code=404, detail=f"No dataset found for source='{source}'"
             )
-        buf = StringIO()
-        data_df.to_csv(buf, index=False)
-        buf.seek(0)
         return StreamingResponse(
-            buf,
+            chain([first_chunk], chunks),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename={source}.csv",
@@ -122,7 +153,7 @@ def download_price_csv(
         500: {"description": "Internal server error"},
     },
 )
-async def upload_price_data(
+def upload_price_data(
     file: UploadFile = File(...),
     db: Session = Depends(deps.get_db),
     delimiter: str = Form(";", description="The delimiter used in the CSV file"),
@@ -159,17 +190,14 @@ async def upload_price_data(
         )
     try:
         if file.filename.endswith(".csv"):
-            df = pd.read_csv(
-                file.file,
-                skiprows=skiprows,
-                delimiter=delimiter,
-                usecols=[DateTimeColumn, ValueColumn],
+            df = read_csv_columns(
+                file.file, skiprows, delimiter, DateTimeColumn, ValueColumn
             )
         else:
             df = pd.read_excel(
                 file.file, skiprows=skiprows, usecols=[DateTimeColumn, ValueColumn]
             )
-    except pd.errors.EmptyDataError:
+    except (pd.errors.EmptyDataError, pa.ArrowInvalid):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Empty/invalid CSV file")
     except Exception as e:
         raise HTTPException(
@@ -178,7 +206,7 @@ async def upload_price_data(
     df.rename(columns={DateTimeColumn: "timestamp", ValueColumn: "price"}, inplace=True)
     df, granularity = ensure_consistent_granularity(df, ignore_timezone=True)  # TODO
     df["source"] = source
-    crud.prices.create_multi(db, obj_in=df.to_dict(orient="records"))
+    crud.prices.copy_multi(db, obj_in=df)
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={"status": "success", "message": "Data uploaded successfully"},
@@ -2,9 +2,8 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import Text
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from forest_ensys import crud, schemas
@@ -35,23 +34,14 @@ def add_process_data(
                 }
             },
         },
-        502: {
-            "description": "Server Error",
-            "content": {
-                "application/json": {
-                    "example": {
-                        "message": "Could not retrieve emissions data. Server probably offline"
-                    }
-                }
-            },
-        },
     },
 )
-def delete_process_data(db: Session = Depends(deps.get_db)) -> Text:
+def delete_process_data(db: Session = Depends(deps.get_db)) -> JSONResponse:
     """
     Delete all process data
     """
     crud.data_parc.delete(db=db)
-    raise HTTPException(
-        status_code=200, detail="Process data table deleted successfully"
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"message": "Process data table deleted successfully"},
     )
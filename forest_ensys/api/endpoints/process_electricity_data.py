@@ -18,12 +18,14 @@ def get_all_process_electricity_data(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: int = 0,
 ) -> List[schemas.ProcessElectricity]:
     """
-    Retrieve all electricity data
+    Retrieve all electricity data ordered by id
+    Pass the id of the last row as after_id to page without OFFSET.
     """
-    process_electricity_data = crud.process_electricity.get_multi(
-        db=db, skip=skip, limit=limit
+    process_electricity_data = crud.process_electricity.get_multi_after(
+        db=db, after_id=after_id, skip=skip, limit=limit
     )
     return process_electricity_data
 
@@ -18,11 +18,15 @@ def get_all_process_heat_data(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: int = 0,
 ) -> List[model.ProcessHeat]:
     """
-    Retrieve all heat data
+    Retrieve all heat data ordered by id
+    Pass the id of the last row as after_id to page without OFFSET.
     """
-    process_heat_data = crud.process_heat.get_multi(db=db, skip=skip, limit=limit)
+    process_heat_data = crud.process_heat.get_multi_after(
+        db=db, after_id=after_id, skip=skip, limit=limit
+    )
     return process_heat_data
 
 
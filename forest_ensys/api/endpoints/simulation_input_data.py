@@ -2,6 +2,9 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import csv
+from itertools import chain
+from typing import Iterator, List
 
 from fastapi import (
     APIRouter,
@@ -14,18 +17,52 @@ from fastapi import (
     Form,
 )
 from fastapi.responses import JSONResponse, StreamingResponse
-from typing import List
 import pandas as pd
+import pyarrow as pa
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
-from forest_ensys import crud
+from forest_ensys import crud, model
 from forest_ensys.api import deps
-from forest_ensys.core.timeseries_helpers import ensure_consistent_granularity
+from forest_ensys.database.session import engine
+from forest_ensys.core.timeseries_helpers import (
+    ensure_consistent_granularity,
+    read_csv_columns,
+)
 from io import StringIO
 
 router = APIRouter()
 
 
+def stream_simulation_input_csv(
+    start_date: datetime, end_date: datetime, name: str
+) -> Iterator[str]:
+    """
+    Yield a simulation input dataset as CSV, fetched through a server-side cursor.
+    Nothing is yielded when there is no data in the range.
+    """
+    statement = select(
+        model.SimulationInputData.timestamp,
+        model.SimulationInputData.name,
+        model.SimulationInputData.value,
+    ).where(
+        model.SimulationInputData.timestamp.between(start_date, end_date),
+        model.SimulationInputData.name == name,
+    )
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["timestamp", "name", "value"])
+    # named (server-side) cursors need a transaction, so leave autocommit here
+    with engine.connect().execution_options(
+        isolation_level="READ COMMITTED", stream_results=True, yield_per=5000
+    ) as connection:
+        for partition in connection.execute(statement).partitions():
+            writer.writerows(partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
 @router.get(
     "/names",
     response_model=List[str],
@@ -71,18 +108,14 @@ def download_simulation_input_csv(
     db: Session = Depends(deps.get_db),
 ):
     try:
-        data_df = crud.simulation_input_data.get_multi_by_date_range_and_name(
-            db=db, start_date=start_date, end_date=end_date, name=name
-        )
-        if data_df is None:
+        chunks = stream_simulation_input_csv(start_date, end_date, name)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
             raise HTTPException(
                 status_code=404, detail=f"No dataset found for name='{name}'"
             )
-        buf = StringIO()
-        data_df.to_csv(buf, index=False)
-        buf.seek(0)
         return StreamingResponse(
-            buf,
+            chain([first_chunk], chunks),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename={name}.csv",
@@ -116,7 +149,7 @@ def download_simulation_input_csv(
         500: {"description": "Internal server error"},
     },
 )
-async def upload_simulation_input_data(
+def upload_simulation_input_data(
     file: UploadFile = File(...),
     db: Session = Depends(deps.get_db),
     name: str = Form(
@@ -169,13 +202,10 @@ async def upload_simulation_input_data(
         )
 
     try:
-        df = pd.read_csv(
-            file.file,
-            skiprows=skiprows,
-            delimiter=delimiter,
-            usecols=[DateTimeColumn, ValueColumn],
+        df = read_csv_columns(
+            file.file, skiprows, delimiter, DateTimeColumn, ValueColumn
         )
-    except pd.errors.EmptyDataError:
+    except (pd.errors.EmptyDataError, pa.ArrowInvalid):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Empty/invalid CSV file")
     except Exception as e:
         raise HTTPException(
@@ -189,10 +219,11 @@ async def upload_simulation_input_data(
     df, granularity = ensure_consistent_granularity(df)
     df["name"] = name
     if unit.lower() == "m³/h" or unit.lower() == "m3/h":
-        df["value"] = df["value"] * heating_value * conversion_factor
+        # fold the factors first, so the column is multiplied only once
+        df["value"] = df["value"] * (heating_value * conversion_factor)
     elif unit.lower() == "kw":
         df["value"] = df["value"] * granularity
-    crud.simulation_input_data.create_multi(db, obj_in=df.to_dict(orient="records"))
+    crud.simulation_input_data.copy_multi(db, obj_in=df)
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={"status": "success", "message": "Data uploaded successfully"},
@@ -4,21 +4,40 @@ from fastapi.responses import JSONResponse
 import logging
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import text
 
 from forest_ensys.api import api_router
 from forest_ensys.core import settings
 from forest_ensys.database import init_db
+from forest_ensys.database.session import engine
 from forest_ensys.api.endpoints.grid_data import update_grid_data_logic
-from forest_ensys.api.endpoints.grid_data import keys as COMMODITY_KEYS
 
 logger = logging.getLogger(__name__)
 
+# any fixed key works, it only has to be the same in every worker process
+SCHEDULER_LOCK_ID = 4169_5097
+
+
+def acquire_scheduler_lock():
+    """
+    Try to take the scheduler advisory lock on a dedicated connection.
+    Only one worker gets it and keeps it until that connection is closed.
+    """
+    connection = engine.connect()
+    if connection.scalar(
+        text("SELECT pg_try_advisory_lock(:id)"), {"id": SCHEDULER_LOCK_ID}
+    ):
+        return connection
+    connection.close()
+    return None
+
+
 def run_grid_update():
     """Scheduled job wrapper - creates its own DB session"""
     from forest_ensys.database import SessionLocal
     db = SessionLocal()
     try:
-        result = update_grid_data_logic(db, COMMODITY_KEYS)
+        result = update_grid_data_logic(db)
         logger.info(f"Grid data update completed: {result}")
     except Exception as e:
         logger.error(f"Grid data update failed: {e}")
@@ -33,23 +52,30 @@ async def lifespan(app: FastAPI):
     init_db.check_connection()
     init_db.create_all()
     
-    # Start scheduler
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(
-        run_grid_update,
-        trigger=CronTrigger(minute=5),
-        id="grid_data_update",
-        max_instances=1,
-        replace_existing=True,
-        coalesce=True,
-    )
-    scheduler.start()
-    logger.info("Grid data scheduler started (runs every hour at :05)")
-    
+    # Start scheduler, in one worker only, every worker runs this lifespan
+    scheduler = None
+    lock_connection = acquire_scheduler_lock()
+    if lock_connection is not None:
+        scheduler = BackgroundScheduler()
+        scheduler.add_job(
+            run_grid_update,
+            trigger=CronTrigger(minute=5),
+            id="grid_data_update",
+            max_instances=1,
+            replace_existing=True,
+            coalesce=True,
+        )
+        scheduler.start()
+        logger.info("Grid data scheduler started (runs every hour at :05)")
+    else:
+        logger.info("Grid data scheduler runs in another worker")
+
     yield
-    
+
     # Shutdown
-    scheduler.shutdown(wait=True)
+    if scheduler is not None:
+        scheduler.shutdown(wait=True)
+        lock_connection.close()
     logger.info("Application shutdown complete")
 
 # Create FastAPI app
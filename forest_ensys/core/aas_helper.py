@@ -1,7 +1,10 @@
 import requests
 import json
+from threading import Lock
 from typing import Dict, Any, Optional, Generator
 
+from cachetools import TTLCache
+
 from aas_core3 import jsonization
 from aas_core3.types import (
     SubmodelElementCollection,
@@ -10,6 +13,12 @@ from aas_core3.types import (
     SubmodelElement,
 )
 
+ENERGY_FLEXIBILITY_SUBMODEL_ID = "aHR0cHM6Ly9hZG1pbi1zaGVsbC5pby9pZHRhL0VuZXJneUZsZXhpYmlsaXR5RGF0YU1vZGVsLzEvMC9FbmVyZ3lGbGV4aWJpbGl0eURhdGFNb2RlbA"
+
+# parameters per submodel id, so repeated requests skip the round trip to the AAS server
+aas_cache = TTLCache(maxsize=16, ttl=60)
+aas_cache_lock = Lock()
+
 needed_properties = [
     "powerMax",
     "regenerationDuration",
@@ -95,9 +104,15 @@ def traverse_elements(
             }
 
 
-def get_data_from_aas() -> Dict[str, Any]:
+def get_data_from_aas(
+    submodel_id: str = ENERGY_FLEXIBILITY_SUBMODEL_ID,
+) -> Dict[str, Any]:
+    with aas_cache_lock:
+        cached = aas_cache.get(submodel_id)
+    if cached is not None:
+        return dict(cached)
+
     server = ServerEasyv3()
-    submodel_id = "aHR0cHM6Ly9hZG1pbi1zaGVsbC5pby9pZHRhL0VuZXJneUZsZXhpYmlsaXR5RGF0YU1vZGVsLzEvMC9FbmVyZ3lGbGV4aWJpbGl0eURhdGFNb2RlbA"
     submodel = server.get_submodel(submodel_id)
 
     return_dict = {}
@@ -110,6 +125,10 @@ def get_data_from_aas() -> Dict[str, Any]:
         for element in submodel.submodel_elements:
             for elem_data in traverse_elements(element):
                 return_dict[elem_data["idShort"]] = elem_data["value"]
+    # failed lookups are not cached, the next request asks the server again
+    if return_dict:
+        with aas_cache_lock:
+            aas_cache[submodel_id] = dict(return_dict)
     return return_dict
 
 
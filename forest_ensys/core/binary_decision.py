@@ -0,0 +1,160 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+from forest_ensys import crud
+from forest_ensys.core.timeseries_helpers import check_granularity_and_merge_multi
+
+
+def run_binary_decision(
+    db: Session,
+    start_date: datetime,
+    end_date: datetime,
+    flexible_power: float,
+    electricity_network_fee: float,
+    gas_emissions_factor: float,
+    cost_per_mwh_gas: float,
+    co2_price: float,
+) -> Row:
+    """
+    Binary decision problem for electric heating: use the flexible power whenever
+    the electricity footprint is below the gas emissions factor.
+    Replaces the stored flexible power time series and optimization result of the case
+    in one transaction and returns the stored result.
+    """
+    # Retrieve data from database
+    footprint_data = crud.footprint.get_multi_by_date_range(
+        db=db, start_date=start_date, end_date=end_date
+    )
+    heat_demand = crud.simulation_input_data.get_multi_by_date_range_and_name(
+        db=db,
+        start_date=start_date,
+        end_date=end_date,
+        name="flexible_device_demand",
+    )
+    if heat_demand is None:
+        raise HTTPException(
+            status_code=404, detail="No heat demand data found for the given date range"
+        )
+    price_data = crud.prices.get_multi_by_date_range_and_source(
+        db=db,
+        start_date=start_date,
+        end_date=end_date,
+        source="smard",
+        price_col="electricity_price",
+    )
+
+    # Merge dataframes and check granularity
+    merged_data = check_granularity_and_merge_multi(
+        [
+            footprint_data,
+            heat_demand[["timestamp", "value"]],
+            price_data[["timestamp", "electricity_price"]],
+        ],
+        methods=["sum", "sum", "mean"],
+    )
+    merged_data["electricity_price"] = (
+        merged_data["electricity_price"] + electricity_network_fee
+    )
+
+    # merged series share one evenly spaced grid, so the first step is the interval
+    timestamps = merged_data["timestamp"]
+    if len(timestamps) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="At least two timestamps are needed to derive the time interval",
+        )
+    time_interval_hours = (timestamps.iat[1] - timestamps.iat[0]).total_seconds() / 3600
+
+    # Decision based on electrical power (kW) at each timestamp
+    use_flexible_power = merged_data["co2"] < gas_emissions_factor
+    total_energy_demand = merged_data["value"].sum()
+    # Work on the raw arrays so every quantity below is a single reduction
+    m = use_flexible_power.to_numpy()
+    co2 = merged_data["co2"].to_numpy()
+    ep = merged_data["electricity_price"].to_numpy()
+    energy_per_interval = flexible_power * time_interval_hours
+    active = int(m.sum())
+    # only intervals heated electrically count towards the savings; when all of
+    # them are, the arrays are used as they are and no masked copy is made
+    if active < len(m):
+        co2, ep = co2[m], ep[m]
+    # Integrate flexible power used and gas usage over time (kWh)
+    electricity_used = active * energy_per_interval
+    gas_usage = total_energy_demand - electricity_used
+
+    emissions_gas_only = total_energy_demand * gas_emissions_factor * 1e-6
+
+    emissions_savings = (
+        (gas_emissions_factor - co2).sum() * energy_per_interval * 1e-6
+    )  # convert to tonnes
+
+    emissions_with_electric_heating = emissions_gas_only - emissions_savings
+
+    cost_gas_only = (
+        total_energy_demand * 1e-3 * cost_per_mwh_gas
+        + emissions_gas_only * 1e-6 * co2_price
+    )
+
+    cost_savings = (
+        emissions_savings * co2_price
+        + (cost_per_mwh_gas - ep).sum() * energy_per_interval * 1e-3
+    )
+
+    cost_with_electric_heating = cost_gas_only - cost_savings
+
+    # Flexible power time series (kWh per interval)
+    flexible_power_rows = [
+        {
+            "timestamp": timestamp,
+            "electricity_used": electricity,
+            "low_price_window": 0,
+            "optimization_case_name": "binary_decision_problem",
+        }
+        for timestamp, electricity in zip(
+            timestamps.tolist(), (m * flexible_power).tolist()
+        )
+    ]
+
+    optimization_results = {
+        "name": "binary_decision_problem",
+        "time_from": start_date,
+        "time_to": end_date,
+        "network_fee_type": "static",
+        "network_fee": 0.0,
+        "total_energy_demand": float(round(total_energy_demand, 2)),
+        "electricity_used": float(round(electricity_used, 2)),
+        "gas_usage": float(round(gas_usage, 2)),
+        "cost_savings": float(round(cost_savings, 2)),
+        "emissions_savings": float(round(emissions_savings, 2)),
+        "cost_gas_only": float(round(cost_gas_only, 2)),
+        "cost_with_electric_heating": float(round(cost_with_electric_heating, 2)),
+        "emissions_gas_only": float(round(emissions_gas_only, 2)),
+        "emissions_with_electric_heating": float(
+            round(emissions_with_electric_heating, 2)
+        ),
+        "full_load_hours": 0,
+        "full_load_hours_after_optimization": 0,
+        "mean_electricity_price_when_heating": (
+            float(ep.mean()) if active else float("nan")
+        ),
+        "electric_heating_in_low_price_windows_ratio": 0,
+    }
+
+    # schedule and result are swapped together, so they always belong to one run
+    with db.get_bind().connect().execution_options(
+        isolation_level="READ COMMITTED"
+    ) as connection, connection.begin():
+        crud.flexible_power.replace_case(
+            db=db,
+            optimization_case_name="binary_decision_problem",
+            rows=flexible_power_rows,
+            connection=connection,
+        )
+        return crud.optimization_results.replace_case(
+            db=db, obj_in=optimization_results, connection=connection
+        )
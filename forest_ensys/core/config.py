@@ -1,3 +1,4 @@
+import os
 import pathlib
 import secrets
 from typing import Optional, Dict, Any
@@ -16,6 +17,16 @@ class Settings(BaseSettings):
 
     SERVER_NAME: str = "FOREST Energy System Model"
 
+    # Run the local server with auto-reload and a single worker
+    DEV_MODE: bool = False
+
+    # Server worker processes, each one has its own connection pool
+    WORKERS: int = os.cpu_count() or 2
+
+    # Database connections all workers together may open, keep it below the
+    # server's max_connections (100 by default on Postgres)
+    DB_MAX_CONNECTIONS: int = 60
+
     # Secret key for hashing passwords
     SECRET_KEY: str = secrets.token_urlsafe(32)
 
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+SMARD commodities and their emission factor production modes.
+"""
+
+keys = {
+    # 411: 'Prognostizierter Stromverbrauch',
+    # 410: 'Realisierter Stromverbrauch',
+    4169: "Preis",
+    4066: "Biomasse",
+    1226: "Wasserkraft",
+    1225: "Wind Offshore",
+    4067: "Wind Onshore",
+    4068: "Photovoltaik",
+    1228: "Sonstige Erneuerbare",
+    1223: "Braunkohle",
+    4071: "Erdgas",
+    4070: "Pumpspeicher",
+    1227: "Sonstige Konventionelle",
+    4069: "Steinkohle",
+    # 5097: 'Prognostizierte Erzeugung PV und Wind Day-Ahead'
+}
+
+grid_to_factors = {
+    "Biomasse": "biomass",
+    "Wasserkraft": "hydro",
+    "Wind Offshore": "wind",
+    "Wind Onshore": "wind",
+    "Photovoltaik": "solar",
+    "Braunkohle": "coal",
+    "Steinkohle": "coal",
+    "Erdgas": "gas",
+    "Sonstige Konventionelle": "gas",
+    "Sonstige Erneuerbare": "solar",
+    "Pumpspeicher": "hydro",
+}
+
+DAY_AHEAD_COMMODITY_ID = 4169
+
+# (commodity id, commodity name, emission factor production mode or None), built
+# once so the update loops walk a tuple instead of the dicts above
+COMMODITIES: tuple[tuple[int, str, str | None], ...] = tuple(
+    (commodity_id, commodity_name, grid_to_factors.get(commodity_name))
+    for commodity_id, commodity_name in keys.items()
+)
+
+# emission factor production mode per generation commodity id
+FACTOR_BY_ID: dict[int, str] = {
+    commodity_id: production_mode
+    for commodity_id, _, production_mode in COMMODITIES
+    if commodity_id != DAY_AHEAD_COMMODITY_ID
+}
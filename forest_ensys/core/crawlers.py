@@ -2,28 +2,37 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import hashlib
 import requests
 import pandas as pd
-from io import StringIO
-from typing import Optional
+from functools import lru_cache
+from io import BytesIO
+from typing import Optional, Tuple
 import logging
 
 MAX_RETRY_ATTEMPTS = 2
 logger = logging.getLogger(__name__)
 
 
-def crawl_emissions_data() -> pd.DataFrame:
+def fetch_emissions_data() -> Tuple[str, bytes]:
     """
-    Crawl the emissions data from the Electricity Maps database.
+    Download the emissions data from the Electricity Maps database.
+    Returns a version tag of the payload (the ETag if sent, else a hash) and the body.
     """
     spreadsheet_id = "1ukTAD_oQKZfq-FgLpbLo_bGOv-UPTaoM_WS316xlDcE"
     url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/export?format=csv"
-    response = requests.get(url)
-    try:
-        response.raise_for_status()
-    except Exception as e:
-        print(f"Coult not crawl emissions data: {e}")
-    df = pd.read_csv(StringIO(response.text))
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    body = response.content
+    return response.headers.get("ETag") or hashlib.sha256(body).hexdigest(), body
+
+
+@lru_cache(maxsize=4)
+def parse_emissions_data(body: bytes) -> pd.DataFrame:
+    """
+    Parse the emissions csv. Cached, so the returned DataFrame must not be modified.
+    """
+    df = pd.read_csv(BytesIO(body))
     df["datetime"] = pd.to_datetime(df["datetime"])
     df = df.dropna()
     return df
@@ -17,19 +17,20 @@ from pyomo.environ import (
 )
 from pyomo.contrib.solver.solvers.highs import Highs
 import gurobipy as gp
+import numpy as np
 import pandas as pd
 import random
 
 
 def optimize_dryers(
-    co2_data: dict,
-    heat_demand_data: dict,
-    electricity_price_data: dict,
-    electricity_demand: dict,
-    window_type: dict,
+    co2_data: np.ndarray | dict,
+    heat_demand_data: np.ndarray | dict,
+    electricity_price_data: np.ndarray | dict,
+    electricity_demand: np.ndarray | dict,
+    window_type: np.ndarray | dict,
     electric_heating: float,
     gas_emissions_factor: float,
-    gas_price_data: dict,
+    gas_price_data: np.ndarray | dict,
     co2_price: float,
     ramp_up_rate: int = 1,
     ramp_down_rate: int = 1,
@@ -39,14 +40,14 @@ def optimize_dryers(
     """
     Optimizes the use of flexible power for electric heating in a dryer system.
     Parameters:
-    - co2_data: DataFrame containing the electricity footprint data.
-    - heat_demand_data: DataFrame containing the heat demand data.
-    - electricity_price_data: DataFrame containing the electricity price data.
-    - electricity_demand: DataFrame containing the electricity demand data.
-    - window_type: DataFrame containing the window type data.
+    - co2_data: Array of the electricity footprint per period.
+    - heat_demand_data: Array of the heat demand per period.
+    - electricity_price_data: Array of the electricity price per period.
+    - electricity_demand: Array of the electricity demand per period.
+    - window_type: Array of the window type per period.
     - electric_heating: Maximum flexible power available for electric heating (kW).
     - gas_emissions_factor: Emissions factor for gas heating (g/kWh).
-    - gas_price_data: DataFrame containing the gas price data.
+    - gas_price_data: Array of the gas price per period.
     - cost_per_mwh_gas: Cost of gas heating per MWh (€/MWh).
     - co2_price: Price of CO2 emissions (€/ton CO2).
     - ramp_up_rate: Maximum ramp-up rate for electric heating (kW/h).
@@ -75,12 +76,17 @@ def optimize_dryers(
     print(f"Time interval: {time_interval_hours} hours")
     model.T = RangeSet(0, num_periods - 1, doc="Time periods (integer indices)")
 
-    model.heat_demand = Param(model.T, initialize=heat_demand_data)
-    model.co2_electricity = Param(model.T, initialize=co2_data)
-    model.price_electricity = Param(model.T, initialize=electricity_price_data)
-    model.price_gas = Param(model.T, initialize=gas_price_data)
-    model.electricity_demand = Param(model.T, initialize=electricity_demand)
-    model.window_type = Param(model.T, initialize=window_type)
+    # index the inputs per period so both arrays and period-keyed dicts work
+    model.heat_demand = Param(model.T, initialize=lambda m, t: heat_demand_data[t])
+    model.co2_electricity = Param(model.T, initialize=lambda m, t: co2_data[t])
+    model.price_electricity = Param(
+        model.T, initialize=lambda m, t: electricity_price_data[t]
+    )
+    model.price_gas = Param(model.T, initialize=lambda m, t: gas_price_data[t])
+    model.electricity_demand = Param(
+        model.T, initialize=lambda m, t: electricity_demand[t]
+    )
+    model.window_type = Param(model.T, initialize=lambda m, t: window_type[t])
     model.max_total_demand = Var(within=NonNegativeReals)
 
     model.flexible_power_max = electric_heating  # kW
@@ -235,12 +241,12 @@ def optimize_dryers(
 
     optimized_results_df = pd.DataFrame(
         {
-            "heat_demand_kwh": heat_demand_data.values(),
+            "heat_demand_kwh": [heat_demand_data[t] for t in model.T],
             "electric_power_used_kW": [
                 value(model.electric_power_used[t]) for t in model.T
             ],
-            "co2_electricity": co2_data.values(),
-            "gas_price": gas_price_data.values(),
+            "co2_electricity": [co2_data[t] for t in model.T],
+            "gas_price": [gas_price_data[t] for t in model.T],
         }
     )
     optimized_results_df["gas_power_used_kwh"] = optimized_results_df[
@@ -3,10 +3,52 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 from datetime import timedelta
 import numpy as np
 
 
+def read_csv_columns(file, skiprows, delimiter, timestamp_column, value_column):
+    """
+    Reads the timestamp and value column of an uploaded CSV file with Arrow's
+    multithreaded reader.
+
+    Parameters:
+    ----------
+    file : file-like object
+        The CSV file.
+    skiprows : int
+        The number of lines before the header row.
+    delimiter : str
+        The delimiter used in the file.
+    timestamp_column : str
+        The name of the column containing the date and time.
+    value_column : str
+        The name of the column containing the values.
+
+    Returns:
+    -------
+    pd.DataFrame
+        The two columns, timestamps kept as text like pandas' own reader does.
+    """
+    # start from the top even if the upload was read before, then step over the
+    # preamble line by line so Arrow begins right at the header row
+    file.seek(0)
+    for _ in range(skiprows):
+        file.readline()
+    table = pacsv.read_csv(
+        file,
+        read_options=pacsv.ReadOptions(skip_rows=0),
+        parse_options=pacsv.ParseOptions(delimiter=delimiter),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=[timestamp_column, value_column],
+            column_types={timestamp_column: pa.string()},
+        ),
+    )
+    return table.to_pandas()
+
+
 def ensure_consistent_granularity(
     df, method="mean", ignore_timezone=False
 ) -> (pd.DataFrame, float):
@@ -77,9 +119,61 @@ def check_granularity_and_merge(df1, df2, method="mean"):
             .reset_index()
         )
         df1_resampled = df1
+    left = df1_resampled.set_index("timestamp")
+    right = df2_resampled.set_index("timestamp")
+    # sorted, unique timestamps on both sides can be aligned on the index without
+    # building a hash table; anything else goes through the regular merge
+    if (
+        left.index.is_monotonic_increasing
+        and left.index.is_unique
+        and right.index.is_monotonic_increasing
+        and right.index.is_unique
+        and left.columns.intersection(right.columns).empty
+    ):
+        return left.join(right, how="inner").reset_index()
     return pd.merge(df1_resampled, df2_resampled, on="timestamp", how="inner")
 
 
+def check_granularity_and_merge_multi(frames, methods=None):
+    """
+    Brings several DataFrames to a common granularity and merges them in one join.
+
+    Same result as chaining check_granularity_and_merge over the frames, where
+    methods[i] is the method used when frames[i] is merged in, but every frame is
+    resampled on its own and the intermediate merges are skipped.
+
+    Parameters:
+    ----------
+    frames : list of pd.DataFrame
+        The DataFrames to merge, each with a "timestamp" column.
+    methods : list of str, optional
+        The resampling method per frame (default is "mean" for all).
+
+    Returns:
+    -------
+    pd.DataFrame
+        The merged DataFrame.
+    """
+    methods = methods or ["mean"] * len(frames)
+    indexed = []
+    granularity = None
+    for df, method in zip(frames, methods):
+        df = df.set_index(pd.to_datetime(df["timestamp"], utc=True)).drop(
+            columns="timestamp"
+        )
+        df_granularity = df.index.to_series().diff().min()
+        if granularity is None:
+            granularity = df_granularity
+        elif granularity < df_granularity:
+            indexed = [frame.resample(df_granularity).agg(method) for frame in indexed]
+            granularity = df_granularity
+        else:
+            df = df.resample(granularity).agg(method)
+        indexed.append(df)
+    merged = indexed[0].join(indexed[1:], how="inner")
+    return merged.rename_axis("timestamp").reset_index()
+
+
 def get_reference_day(date):
     weekday = date.weekday()
     if weekday < 5:  # Mon-Fri
@@ -17,3 +17,4 @@ from .flexible_power import flexible_power
 from .optimization_results import optimization_results
 from .prices import prices
 from .simulation_input_data import simulation_input_data
+from .job import job
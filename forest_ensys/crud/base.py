@@ -1,3 +1,5 @@
+import csv
+import io
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
@@ -11,6 +13,11 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# rows per statement for bulk inserts, keeps driver buffers bounded on large backfills
+INSERT_CHUNK_SIZE = 5000
+# from this many rows on, bulk inserts go through COPY instead of executemany
+COPY_THRESHOLD = 10_000
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
@@ -30,6 +37,23 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_multi_after(
+        self, db: Session, *, after_id: Any = 0, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        """
+        Keyset page of rows ordered by id, starting after the id of the last row
+        of the previous page. Unlike OFFSET, deep pages cost the same as the first;
+        skip is still applied on top for callers paging by offset.
+        """
+        return (
+            db.query(self.model)
+            .filter(self.model.id > after_id)
+            .order_by(self.model.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
     def get_multi_by_date_range(
         self, db: Session, start_date: datetime = None, end_date: datetime = None
     ) -> Optional[pd.DataFrame]:
@@ -74,6 +98,61 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    def records_from_frame(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Rows of a DataFrame as executemany parameters, restricted to table columns.
+        Built from whole columns, which skips the per-row work of to_dict("records").
+        """
+        columns = [
+            column for column in df.columns if column in self.model.__table__.columns
+        ]
+        return [
+            dict(zip(columns, row))
+            for row in zip(*(df[column].tolist() for column in columns))
+        ]
+
+    def copy_multi(
+        self, db: Session, *, obj_in: Union[List[Dict[str, Any]], pd.DataFrame]
+    ) -> int:
+        """
+        Bulk load records with COPY FROM STDIN into a temporary table, then move them
+        over with INSERT ... SELECT. Rows that already exist are skipped, the number
+        of new rows is returned. A DataFrame is written to the COPY buffer column-wise.
+        """
+        if len(obj_in) == 0:
+            return 0
+        table = self.model.__tablename__
+        fields = obj_in.columns if isinstance(obj_in, pd.DataFrame) else obj_in[0]
+        columns = [
+            column for column in fields if column in self.model.__table__.columns
+        ]
+        column_list = ", ".join(columns)
+        buffer = io.StringIO()
+        if isinstance(obj_in, pd.DataFrame):
+            obj_in[columns].to_csv(buffer, header=False, index=False, na_rep="NaN")
+        else:
+            csv.writer(buffer).writerows(
+                [record[column] for column in columns] for record in obj_in
+            )
+        buffer.seek(0)
+        # the temporary table lives until commit, so this needs a real transaction
+        with db.get_bind().connect().execution_options(
+            isolation_level="READ COMMITTED"
+        ) as connection, connection.begin():
+            connection.exec_driver_sql(
+                f"CREATE TEMP TABLE {table}_copy (LIKE {table}) ON COMMIT DROP"
+            )
+            with connection.connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {table}_copy ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+            inserted = connection.exec_driver_sql(
+                f"INSERT INTO {table} ({column_list}) "
+                f"SELECT {column_list} FROM {table}_copy ON CONFLICT DO NOTHING"
+            ).rowcount
+        return inserted
+
     def create_multi(
         self, db: Session, *, obj_in: List[Union[CreateSchemaType, ModelType, dict]]
     ) -> List[ModelType]:
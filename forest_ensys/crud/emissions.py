@@ -2,16 +2,38 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import Optional
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
 
+from cachetools import TTLCache
+from cachetools.keys import hashkey
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import bindparam, delete, desc, func, select
+from sqlalchemy.dialects.postgresql import insert
 
 
 from forest_ensys.crud.base import CRUDBase
 from forest_ensys.model import Emissions
 from forest_ensys.schemas import EmissionsCreate, EmissionsUpdate
 
+# plain values, cleared by create_multi() and delete() in this worker; other workers
+# see a crawl or delete once their entries expire
+specific_emissions_cache = TTLCache(maxsize=256, ttl=3600)
+specific_emissions_lock = Lock()
+_MISSING = object()
+
+# built once at import, only the bound parameters change per call
+SPECIFIC_EMISSIONS_STATEMENT = (
+    select(Emissions.__table__)
+    .where(
+        Emissions.zone_key == bindparam("zone_key"),
+        Emissions.emission_factor_type == bindparam("emission_type"),
+        Emissions.production_mode == bindparam("production_mode"),
+    )
+    .order_by(desc(Emissions.timestamp))
+    .limit(1)
+)
+
 
 class CRUDEmissions(CRUDBase[Emissions, EmissionsCreate, EmissionsUpdate]):
     def get_current_emissions(self, db: Session) -> Optional[Emissions]:
@@ -22,19 +44,84 @@ class CRUDEmissions(CRUDBase[Emissions, EmissionsCreate, EmissionsUpdate]):
             Emissions.emission_factor_type == "direct",
         )
 
+    def _cached(self, key: tuple, load: Callable[[], Any]) -> Any:
+        with specific_emissions_lock:
+            value = specific_emissions_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = load()
+        # misses are not cached, data crawled in another worker shows up right away
+        if value:
+            with specific_emissions_lock:
+                specific_emissions_cache[key] = value
+        return value
+
     def get_specific_emissions(
         self, db: Session, *, zone_key: str, emission_type: str, production_mode: str
-    ) -> Optional[Emissions]:
-        return (
-            db.query(Emissions)
-            .filter(
-                Emissions.zone_key == zone_key,
-                Emissions.emission_factor_type == emission_type,
-                Emissions.production_mode == production_mode,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Latest emissions row of a zone, type and production mode as a plain dict.
+        """
+
+        def load() -> Optional[Dict[str, Any]]:
+            row = (
+                db.execute(
+                    SPECIFIC_EMISSIONS_STATEMENT,
+                    {
+                        "zone_key": zone_key,
+                        "emission_type": emission_type,
+                        "production_mode": production_mode,
+                    },
+                )
+                .mappings()
+                .one_or_none()
             )
-            .order_by(desc(Emissions.timestamp))
-            .first()
+            return dict(row) if row else None
+
+        key = hashkey("specific", zone_key, emission_type, production_mode)
+        value = self._cached(key, load)
+        return dict(value) if value else None
+
+    def get_latest_values_by_production_mode(
+        self,
+        db: Session,
+        *,
+        zone_key: str,
+        emission_type: str,
+        production_modes: List[str],
+    ) -> Dict[str, float]:
+        """
+        Latest emission factor of every given production mode, read in one query.
+        """
+
+        def load() -> Dict[str, float]:
+            rows = db.execute(
+                select(Emissions.production_mode, Emissions.value)
+                .where(
+                    Emissions.zone_key == zone_key,
+                    Emissions.emission_factor_type == emission_type,
+                    Emissions.production_mode.in_(production_modes),
+                )
+                .distinct(Emissions.production_mode)
+                .order_by(Emissions.production_mode, desc(Emissions.timestamp))
+            ).all()
+            return {production_mode: value for production_mode, value in rows}
+
+        key = hashkey(
+            "latest",
+            zone_key,
+            emission_type,
+            tuple(sorted(production_modes)),
         )
+        return dict(self._cached(key, load))
+
+    def get_version(self, db: Session) -> str:
+        """
+        Newest timestamp in the table, an index-only probe on the primary key.
+        Crawls append newer rows and delete() empties the table, so both change it.
+        """
+        latest = db.execute(select(func.max(Emissions.timestamp))).scalar()
+        return latest.isoformat() if latest else "empty"
 
     def create(
         self, db: Session, obj_in=Emissions | EmissionsCreate | dict[str, any]
@@ -42,9 +129,32 @@ class CRUDEmissions(CRUDBase[Emissions, EmissionsCreate, EmissionsUpdate]):
         new_dataset: Emissions = super().create_multi(db=db, obj_in=obj_in)
         return new_dataset
 
+    def create_multi(self, db: Session, *, obj_in: List[Dict[str, Any]]) -> int:
+        """
+        Insert all records with one executemany instead of one ORM object per row.
+        Rows that already exist are skipped, the number of new rows is returned.
+        """
+        if not obj_in:
+            return 0
+        statement = (
+            insert(Emissions).on_conflict_do_nothing().returning(Emissions.timestamp)
+        )
+        inserted = len(db.execute(statement, obj_in).all())
+        db.commit()
+        if inserted:
+            self.clear_cache()
+        return inserted
+
+    def clear_cache(self) -> None:
+        with specific_emissions_lock:
+            specific_emissions_cache.clear()
+
     # do a delete from emissions
-    def delete(self, db: Session) -> Optional[Emissions]:
-        return db.query(Emissions).delete()
+    def delete(self, db: Session) -> int:
+        deleted = db.execute(delete(Emissions)).rowcount
+        db.commit()
+        self.clear_cache()
+        return deleted
 
 
 emissions = CRUDEmissions(Emissions)
@@ -2,6 +2,8 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Connection, delete, insert
 from sqlalchemy.orm import Session
 from forest_ensys.model import FlexiblePower
 from forest_ensys.schemas import FlexiblePowerCreate, FlexiblePowerUpdate
@@ -29,6 +31,47 @@ class CRUDFlexiblePower(
     #     db.commit()
     #     return db_objs
 
+    def bulk_insert(self, db: Session, *, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert the rows with one Core executemany, skipping ORM object creation.
+        """
+        if not rows:
+            return 0
+        db.execute(insert(FlexiblePower), rows)
+        db.commit()
+        return len(rows)
+
+    def replace_case(
+        self,
+        db: Session,
+        *,
+        optimization_case_name: str,
+        rows: List[Dict[str, Any]],
+        connection: Optional[Connection] = None,
+    ) -> int:
+        """
+        Swap the stored series of an optimization case for rows in one transaction.
+        Pass connection to run the swap in a transaction the caller already began.
+        """
+        if connection is None:
+            with db.get_bind().connect().execution_options(
+                isolation_level="READ COMMITTED"
+            ) as connection, connection.begin():
+                return self.replace_case(
+                    db,
+                    optimization_case_name=optimization_case_name,
+                    rows=rows,
+                    connection=connection,
+                )
+        connection.execute(
+            delete(FlexiblePower).where(
+                FlexiblePower.optimization_case_name == optimization_case_name
+            )
+        )
+        if rows:
+            connection.execute(insert(FlexiblePower), rows)
+        return len(rows)
+
     def get_multi_flexible_power(self, db: Session, skip: int = 0, limit: int = 100):
         return db.query(FlexiblePower).offset(skip).limit(limit).all()
 
@@ -2,11 +2,12 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+from datetime import datetime
 from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, insert, select
 from forest_ensys.crud.base import CRUDBase
-from forest_ensys.model import Footprint
+from forest_ensys.model import Footprint, Grid
 from forest_ensys.schemas import FootprintCreate, FootprintUpdate
 
 
@@ -18,6 +19,30 @@ class CRUDFootprint(CRUDBase[Footprint, FootprintCreate, FootprintUpdate]):
         new_dataset: Footprint = super().create(db, obj_in=obj_in)
         return new_dataset
 
+    def recompute_from_grid(self, db: Session, since: Optional[datetime] = None) -> int:
+        """
+        Derive the footprint of every grid timestamp that has none yet, inside the database.
+        Timestamps whose co2 sums to zero are missing data and are skipped.
+        With since, only grid rows from that timestamp on are considered.
+        """
+        total_co2 = func.sum(Grid.co2)
+        footprint_by_timestamp = (
+            select(Grid.timestamp, total_co2 / (func.sum(Grid.mwh) * 1000))
+            .outerjoin(Footprint, Grid.timestamp == Footprint.timestamp)
+            .where(Footprint.timestamp.is_(None))
+            .group_by(Grid.timestamp)
+            .having(total_co2 != 0)
+        )
+        if since is not None:
+            footprint_by_timestamp = footprint_by_timestamp.where(
+                Grid.timestamp >= since
+            )
+        inserted = db.execute(
+            insert(Footprint).from_select(["timestamp", "co2"], footprint_by_timestamp)
+        ).rowcount
+        db.commit()
+        return inserted
+
     # def get_multi_by_date_range(self,db: Session, start_date: datetime, end_date: datetime):
     #     return db.query(Footprint).filter(Footprint.timestamp >= start_date, Footprint.timestamp <= end_date).all()
     def delete(self, db: Session) -> Optional[Footprint]:
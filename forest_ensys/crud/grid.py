@@ -2,12 +2,14 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import Optional, Any, List
+from datetime import datetime
+from typing import Optional, Any, Dict, List, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects.postgresql import insert
 import pandas as pd
-from forest_ensys.crud.base import CRUDBase
-from forest_ensys.model import Grid, Footprint
+from forest_ensys.crud.base import CRUDBase, COPY_THRESHOLD, INSERT_CHUNK_SIZE
+from forest_ensys.model import Grid
 from forest_ensys.schemas import GridCreate, GridUpdate
 
 
@@ -24,23 +26,56 @@ class CRUDGrid(CRUDBase[Grid, GridCreate, GridUpdate]):
             .first()
         )
 
-    def get_average_co2_by_commodity(self, db: Session) -> List:
-        return (
-            db.query(
-                Grid.timestamp,
-                func.sum(Grid.co2).label("total_co2"),
-                func.sum(Grid.mwh).label("total_mwh"),
+    def get_multi_as_dicts(
+        self, db: Session, *, skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Like get_multi, but as plain column dicts without building ORM objects.
+        """
+        rows = db.execute(select(Grid.__table__).offset(skip).limit(limit))
+        return [dict(row) for row in rows.mappings()]
+
+    def get_latest_timestamps_by_commodity(self, db: Session) -> Dict[int, datetime]:
+        """
+        Latest timestamp of every commodity, read in one grouped query.
+        """
+        rows = db.execute(
+            select(Grid.commodity_id, func.max(Grid.timestamp)).group_by(
+                Grid.commodity_id
             )
-            .outerjoin(Footprint, Grid.timestamp == Footprint.timestamp)
-            .filter(Footprint.timestamp.is_(None))
-            .group_by(Grid.timestamp)
-            .all()
-        )
+        ).all()
+        return {commodity_id: latest for commodity_id, latest in rows}
 
     def create(self, db: Session, obj_in: Grid | dict[str, Any]) -> Optional[Grid]:
         new_dataset: Grid = super().create(db, obj_in=obj_in)
         return new_dataset
 
+    def create_multi(
+        self, db: Session, *, obj_in: Union[List[Dict[str, Any]], pd.DataFrame]
+    ) -> int:
+        """
+        Insert all records with one Core executemany instead of one ORM object per row.
+        Rows that already exist are skipped, the number of new rows is returned.
+        Large DataFrames go to COPY column-wise, without building records.
+        """
+        if len(obj_in) == 0:
+            return 0
+        if len(obj_in) >= COPY_THRESHOLD:
+            return self.copy_multi(db, obj_in=obj_in)
+        if isinstance(obj_in, pd.DataFrame):
+            obj_in = self.records_from_frame(obj_in)
+        statement = (
+            insert(Grid)
+            .on_conflict_do_nothing(index_elements=["timestamp", "commodity_id"])
+            .returning(Grid.timestamp)
+        )
+        inserted = 0
+        for start in range(0, len(obj_in), INSERT_CHUNK_SIZE):
+            chunk = obj_in[start : start + INSERT_CHUNK_SIZE]
+            inserted += len(db.execute(statement, chunk).all())
+        db.commit()
+        return inserted
+
     def delete(self, db: Session) -> Optional[Grid]:
         return db.query(Grid).delete()
 
@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from typing import Any, Optional
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from forest_ensys.crud.base import CRUDBase
+from forest_ensys.model import Job
+
+
+class CRUDJob(CRUDBase[Job, Any, Any]):
+    def create(self, db: Session, *, name: str) -> Job:
+        """
+        Registers a new pending job.
+        """
+        now = datetime.now(timezone.utc)
+        return super().create(
+            db,
+            obj_in={
+                "id": uuid4().hex,
+                "name": name,
+                "status": "pending",
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+
+    def get(self, db: Session, id: str) -> Optional[Job]:
+        return db.get(Job, id)
+
+    def set_status(
+        self, db: Session, *, id: str, status: str, result: Any = None
+    ) -> Optional[Job]:
+        db_obj = self.get(db, id)
+        if db_obj is None:
+            return None
+        db_obj.status = status
+        db_obj.result = result
+        db_obj.updated_at = datetime.now(timezone.utc)
+        db.commit()
+        return db_obj
+
+
+job = CRUDJob(Job)
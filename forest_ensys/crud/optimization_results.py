@@ -2,7 +2,8 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import Optional, Any
+from typing import Optional, Any, Dict
+from sqlalchemy import Connection, Row, delete, insert
 from sqlalchemy.orm import Session
 from forest_ensys.crud.base import CRUDBase
 from forest_ensys.model import OptimizationResult
@@ -13,6 +14,29 @@ class CRUDOptimizationResults(CRUDBase[OptimizationResult, Any, Any]):
         db_obj = super().create(db, obj_in=obj_in)
         return db_obj
 
+    def replace_case(
+        self,
+        db: Session,
+        *,
+        obj_in: Dict[str, Any],
+        connection: Optional[Connection] = None,
+    ) -> Row:
+        """
+        Replace the stored result of the optimization case obj_in["name"] in one transaction.
+        Pass connection to run the swap in a transaction the caller already began.
+        """
+        if connection is None:
+            with db.get_bind().connect().execution_options(
+                isolation_level="READ COMMITTED"
+            ) as connection, connection.begin():
+                return self.replace_case(db, obj_in=obj_in, connection=connection)
+        columns = self.model.__table__.columns.keys()
+        values = {k: v for k, v in obj_in.items() if k in columns}
+        connection.execute(delete(self.model).where(self.model.name == values["name"]))
+        return connection.execute(
+            insert(self.model).values(values).returning(*self.model.__table__.c)
+        ).one()
+
     def get(
         self, db: Session, *, optimization_case_name: str
     ) -> Optional[OptimizationResult]:
@@ -31,9 +55,11 @@ class CRUDOptimizationResults(CRUDBase[OptimizationResult, Any, Any]):
     def delete_by_optimization_case_name(
         self, db: Session, *, optimization_case_name: str
     ) -> None:
-        db.query(self.model).filter(
-            self.model.name == optimization_case_name,
-        ).delete()
+        # one DELETE statement, no need to sync the identity map for these rows
+        db.execute(
+            delete(self.model).where(self.model.name == optimization_case_name),
+            execution_options={"synchronize_session": False},
+        )
         db.commit()
 
 
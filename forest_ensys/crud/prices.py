@@ -2,15 +2,23 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import Optional, Any, List
+from threading import Lock
+from typing import Optional, Any, Dict, List, Union
+
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from sqlalchemy import text
-from forest_ensys.crud.base import CRUDBase
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects.postgresql import insert
+from forest_ensys.crud.base import CRUDBase, COPY_THRESHOLD, INSERT_CHUNK_SIZE
 from forest_ensys.model import Prices
 from datetime import datetime
 import pandas as pd
 
+# cleared by every write in this worker (create_multi, copy_multi, delete); other
+# workers see an upload or delete once the entry expires
+price_sources_cache = TTLCache(maxsize=4, ttl=60)
+
 
 class CRUDPrices(CRUDBase[Prices, Any, Any]):
     def get_by_timestamp(self, db: Session, *, timestamp: Any) -> Optional[Prices]:
@@ -24,6 +32,16 @@ class CRUDPrices(CRUDBase[Prices, Any, Any]):
             .first()
         )
 
+    def get_latest_timestamp(
+        self, db: Session, *, source: str = "smard"
+    ) -> Optional[datetime]:
+        """
+        Latest timestamp of a source as a single scalar, without loading the row.
+        """
+        return db.scalar(
+            select(func.max(Prices.timestamp)).where(Prices.source == source)
+        )
+
     def get_by_timestamp_range(
         self, db: Session, *, start: Any, end: Any
     ) -> List[Prices]:
@@ -45,24 +63,24 @@ class CRUDPrices(CRUDBase[Prices, Any, Any]):
         )
 
     def get_multi_by_date_range_and_source(
-        self, db: Session, *, start_date: datetime, end_date: datetime, source: str
+        self,
+        db: Session,
+        *,
+        start_date: datetime,
+        end_date: datetime,
+        source: str,
+        price_col: str = "price",
     ) -> Optional[pd.DataFrame]:
-        query = """
-            SELECT * 
-            FROM prices
-            WHERE timestamp BETWEEN :start_date AND :end_date AND source = :source
         """
+        Prices of a source in the date range. The price column is named price_col,
+        so callers merging several price series need no extra rename.
+        """
+        query = select(
+            Prices.timestamp, Prices.source, Prices.price.label(price_col)
+        ).where(Prices.timestamp.between(start_date, end_date), Prices.source == source)
 
         # Abfrage ausführen
-        result = pd.read_sql_query(
-            sql=text(query),
-            con=db.connection(),
-            params={
-                "start_date": start_date,
-                "end_date": end_date,
-                "source": source,
-            },
-        )
+        result = pd.read_sql_query(sql=query, con=db.connection())
 
         return result if not result.empty else None
 
@@ -70,9 +88,55 @@ class CRUDPrices(CRUDBase[Prices, Any, Any]):
         new_dataset: Prices = super().create(db, obj_in=obj_in)
         return new_dataset
 
+    def create_multi(
+        self, db: Session, *, obj_in: Union[List[Dict[str, Any]], pd.DataFrame]
+    ) -> int:
+        """
+        Insert all records with one Core executemany instead of one ORM object per row.
+        Rows that already exist are skipped, the number of new rows is returned.
+        Large DataFrames go to COPY column-wise, without building records.
+        """
+        if len(obj_in) == 0:
+            return 0
+        if len(obj_in) >= COPY_THRESHOLD:
+            return self.copy_multi(db, obj_in=obj_in)
+        if isinstance(obj_in, pd.DataFrame):
+            obj_in = self.records_from_frame(obj_in)
+        statement = (
+            insert(Prices)
+            .on_conflict_do_nothing(index_elements=["timestamp", "source"])
+            .returning(Prices.timestamp)
+        )
+        inserted = 0
+        for start in range(0, len(obj_in), INSERT_CHUNK_SIZE):
+            chunk = obj_in[start : start + INSERT_CHUNK_SIZE]
+            inserted += len(db.execute(statement, chunk).all())
+        db.commit()
+        if inserted:
+            self.clear_cache()
+        return inserted
+
+    def copy_multi(
+        self, db: Session, *, obj_in: Union[List[Dict[str, Any]], pd.DataFrame]
+    ) -> int:
+        inserted = super().copy_multi(db, obj_in=obj_in)
+        if inserted:
+            self.clear_cache()
+        return inserted
+
+    def clear_cache(self) -> None:
+        price_sources_cache.clear()
+
     def delete(self, db: Session, source: str) -> Optional[Prices]:
-        return db.query(Prices).filter(Prices.source == source).delete()
+        deleted = db.query(Prices).filter(Prices.source == source).delete()
+        self.clear_cache()
+        return deleted
 
+    @cached(
+        cache=price_sources_cache,
+        key=lambda self, db: hashkey("sources"),
+        lock=Lock(),
+    )
     def get_distinct_names(self, db: Session) -> list[str]:
         rows = db.query(self.model.source).distinct().order_by(self.model.source).all()
         return [r[0] for r in rows]
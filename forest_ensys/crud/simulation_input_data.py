@@ -2,8 +2,12 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from typing import Optional, Any
+from threading import Lock
+from typing import Optional, Any, Dict, List, Union
 
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import text
 
@@ -12,6 +16,10 @@ from forest_ensys.model import SimulationInputData
 from datetime import datetime
 import pandas as pd
 
+# cleared by every write in this worker (copy_multi, delete_by_name); other workers
+# see an upload or delete once the entry expires
+simulation_input_names_cache = TTLCache(maxsize=4, ttl=60)
+
 
 class CRUDSimulationInputData(CRUDBase[SimulationInputData, Any, Any]):
     def create(
@@ -24,7 +32,24 @@ class CRUDSimulationInputData(CRUDBase[SimulationInputData, Any, Any]):
     def delete_by_name(
         self, db: Session, *, name: str
     ) -> Optional[SimulationInputData]:
-        return db.query(self.model).filter(self.model.name == name).delete()
+        # one DELETE statement, no need to sync the identity map for these rows
+        deleted = db.execute(
+            delete(self.model).where(self.model.name == name),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        self.clear_cache()
+        return deleted
+
+    def copy_multi(
+        self, db: Session, *, obj_in: Union[List[Dict[str, Any]], pd.DataFrame]
+    ) -> int:
+        inserted = super().copy_multi(db, obj_in=obj_in)
+        if inserted:
+            self.clear_cache()
+        return inserted
+
+    def clear_cache(self) -> None:
+        simulation_input_names_cache.clear()
 
     def get_multi_by_date_range_and_name(
         self, db: Session, *, start_date: datetime, end_date: datetime, name: str
@@ -44,6 +69,11 @@ class CRUDSimulationInputData(CRUDBase[SimulationInputData, Any, Any]):
 
         return result if not result.empty else None
     
+    @cached(
+        cache=simulation_input_names_cache,
+        key=lambda self, db: hashkey("names"),
+        lock=Lock(),
+    )
     def get_distinct_names(self, db: Session) -> list[str]:
         rows = db.query(self.model.name).distinct().order_by(self.model.name).all()
         return [r[0] for r in rows]
@@ -5,3 +5,5 @@
 """
 This package contains everything needed for the database.
 """
+
+from .session import engine, SessionLocal
@@ -9,8 +9,9 @@ logger = logging.getLogger(__name__)
 
 def check_connection():
     try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+        logger.info(f"Database reachable, pool: {engine.pool.status()}")
     except Exception as e:
         logger.error(e)
         raise e
@@ -18,3 +19,7 @@ def check_connection():
 
 def create_all():
     Base.metadata.create_all(engine)
+    # create_all skips existing tables, so add indexes that were introduced later
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
@@ -1,15 +1,25 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session, sessionmaker
 
 from forest_ensys.core import settings
 
+# Use the default QueuePool so requests served from FastAPI's threadpool each
+# check out their own connection instead of serializing on a single shared one.
+# Every worker process has its own pool, so the connection budget is split
+# between them, with a small overflow on top of the steady pool.
+workers = 1 if settings.DEV_MODE else max(1, settings.WORKERS)
+connections_per_worker = max(2, settings.DB_MAX_CONNECTIONS // workers)
+pool_overflow = min(5, max(1, connections_per_worker // 4))
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
     execution_options={"isolation_level": "AUTOCOMMIT"},
+    pool_size=connections_per_worker - pool_overflow,
+    max_overflow=pool_overflow,
     pool_pre_ping=True,
-    poolclass=StaticPool,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+    query_cache_size=1200,
 )
 SessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+    bind=engine, class_=Session, autoflush=False, expire_on_commit=False
 )
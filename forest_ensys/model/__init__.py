@@ -17,3 +17,4 @@ from .flexible_power import FlexiblePower
 from .optimization_results import OptimizationResult
 from .prices import Prices
 from .simulation_input_data import SimulationInputData
+from .job import Job
@@ -2,7 +2,7 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from sqlalchemy import Column, String, Double, DateTime
+from sqlalchemy import Column, String, Double, DateTime, Index
 from forest_ensys.database.base_class import Base
 
 
@@ -17,3 +17,13 @@ class Emissions(Base):
     production_mode = Column(String, primary_key=True, nullable=False)
     value = Column(Double, nullable=False)
     source = Column(String, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_emissions_zone_type_mode",
+            "zone_key",
+            "emission_factor_type",
+            "production_mode",
+            timestamp.desc(),
+        ),
+    )
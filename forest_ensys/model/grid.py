@@ -2,7 +2,7 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from sqlalchemy import Column, Integer, String, Double, DateTime
+from sqlalchemy import Column, Integer, String, Double, DateTime, Index
 from forest_ensys.database.base_class import Base
 
 
@@ -16,3 +16,5 @@ class Grid(Base):
     commodity_name = Column(String, nullable=False)
     mwh = Column(Double, nullable=False)
     co2 = Column(Double, nullable=False)
+
+    __table_args__ = (Index("ix_grid_commodity_ts", "commodity_id", timestamp.desc()),)
@@ -0,0 +1,19 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from sqlalchemy import Column, DateTime, String, JSON
+from forest_ensys.database.base_class import Base
+
+
+class Job(Base):
+    """
+    Database class for long running tasks that are executed in the background.
+    """
+
+    id = Column(String, primary_key=True, nullable=False)
+    name = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    result = Column(JSON, nullable=True)
@@ -2,7 +2,7 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-from sqlalchemy import Column, Double, DateTime, String
+from sqlalchemy import Column, Double, DateTime, String, Index
 from forest_ensys.database.base_class import Base
 
 
@@ -10,3 +10,5 @@ class Prices(Base):
     timestamp = Column(DateTime, primary_key=True, nullable=False)
     source = Column(String, primary_key=True, nullable=False)
     price = Column(Double, nullable=False)
+
+    __table_args__ = (Index("ix_prices_source_ts", "source", timestamp.desc()),)
@@ -21,3 +21,4 @@ from .data_parc import DataParc, DataParcCreate, DataParcUpdate
 from .optimization_results import OptimizationResult
 from .prices import Prices
 from .flexible_power import FlexiblePower, FlexiblePowerCreate, FlexiblePowerUpdate
+from .job import Job
@@ -0,0 +1,44 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from typing import Any, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+
+
+class Job(BaseModel):
+    """
+    Attributes to return via API for a background job.
+    """
+
+    id: Optional[str] = Field(
+        default=None,
+        description="Id of the job.",
+        example="3f2b9c0e4a5d4e6f8a7b6c5d4e3f2a1b",
+    )
+    name: Optional[str] = Field(
+        default=None, description="Task the job is running.", example="emissions_update"
+    )
+    status: Optional[str] = Field(
+        default=None,
+        description="State of the job.",
+        example="pending, running, finished or failed",
+    )
+    created_at: Optional[datetime] = Field(
+        default=None,
+        description="Date and time when the job was queued.",
+        example="2020-01-01 00:00:00",
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        description="Date and time of the last status change.",
+        example="2020-01-01 00:00:00",
+    )
+    result: Optional[Any] = Field(
+        default=None,
+        description="Result or error message of the job once it is done.",
+        example={"inserted": 120},
+    )
+
+    model_config = ConfigDict(from_attributes=True)
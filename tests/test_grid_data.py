@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("fastapi")
+
+from forest_ensys.api.endpoints.grid_data import (
+    calculate_start_timestamps,
+    start_timestamps_unix,
+)
+
+DEFAULT_START_DATE = "12-31-2023 22:00:00"
+
+
+def old_calculate_start_timestamps(latest, default_start_date):
+    """
+    calculate_start_timestamps as it was computed per call before it was simplified.
+    """
+    if latest is None:
+        latest = pd.to_datetime(default_start_date)
+        latest = latest.replace(tzinfo=None)
+    if latest.weekday() != 6 or (
+        latest.hour < 22 or (latest.hour == 21 and latest.minute < 45)
+    ):
+        days_since_sunday = (latest.weekday() + 1) % 7
+        last_sunday = latest - timedelta(days=days_since_sunday)
+        last_sunday = last_sunday.replace(hour=22, minute=0, second=0, microsecond=0)
+        latest = last_sunday
+    if latest.hour == 21 and latest.minute == 45:
+        timestamp1 = latest.replace(hour=22, minute=0, second=0, microsecond=0)
+        timestamp2 = latest.replace(hour=23, minute=0, second=0, microsecond=0)
+    else:
+        timestamp1 = latest.replace(hour=23, minute=0, second=0, microsecond=0)
+        timestamp2 = latest.replace(hour=22, minute=0, second=0, microsecond=0)
+    return timestamp1, timestamp2
+
+
+def to_unix_ms(timestamps):
+    return tuple(int(timestamp.timestamp() * 1000) for timestamp in timestamps)
+
+
+# every quarter hour of the two weeks around the 2023/2024 new year, which starts
+# on a Sunday
+QUARTER_HOURS = [
+    datetime(2023, 12, 24) + timedelta(minutes=15 * step) for step in range(15 * 24 * 4)
+]
+
+
+@pytest.mark.parametrize("tzinfo", [timezone.utc, None])
+def test_start_timestamps_match_old_computation(tzinfo):
+    for latest in QUARTER_HOURS:
+        latest = latest.replace(tzinfo=tzinfo)
+        expected = old_calculate_start_timestamps(latest, DEFAULT_START_DATE)
+
+        assert (
+            calculate_start_timestamps(latest, DEFAULT_START_DATE) == expected
+        ), latest
+        assert start_timestamps_unix(latest, DEFAULT_START_DATE) == to_unix_ms(
+            expected
+        ), latest
+
+
+@pytest.mark.parametrize(
+    "default_start_date", [DEFAULT_START_DATE, "01-01-2024 00:00:00", "2023-12-27"]
+)
+def test_start_timestamps_without_data_use_default(default_start_date):
+    expected = old_calculate_start_timestamps(None, default_start_date)
+
+    assert calculate_start_timestamps(None, default_start_date) == expected
+    assert start_timestamps_unix(None, default_start_date) == to_unix_ms(expected)
+
+
+def test_start_timestamps_across_year_boundary():
+    # the week of 2024-01-01 is keyed on Sunday 2023-12-31
+    latest = datetime(2024, 1, 2, 12, tzinfo=timezone.utc)
+
+    assert calculate_start_timestamps(latest, DEFAULT_START_DATE) == (
+        datetime(2023, 12, 31, 23, tzinfo=timezone.utc),
+        datetime(2023, 12, 31, 22, tzinfo=timezone.utc),
+    )
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from forest_ensys import crud
+from forest_ensys.api import deps
+from forest_ensys.api.endpoints import price_data
+
+PRICE_CSV_WITH_PREAMBLE = (
+    "Preise Day-Ahead\n"
+    "Quelle: greenPFC\n"
+    "Einheit: EUR/MWh\n"
+    "timestamp;price\n"
+    "2024-01-01 00:00:00;50.5\n"
+    "2024-01-01 00:15:00;51.0\n"
+    "2024-01-01 00:30:00;49.25\n"
+)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(price_data.router, prefix="/prices")
+    app.dependency_overrides[deps.get_db] = lambda: None
+    return TestClient(app)
+
+
+def test_upload_skips_preamble_with_default_skiprows(client, monkeypatch):
+    stored = {}
+
+    def copy_multi(db, *, obj_in):
+        stored["df"] = obj_in
+        return len(obj_in)
+
+    monkeypatch.setattr(crud.prices, "copy_multi", copy_multi)
+
+    response = client.post(
+        "/prices/",
+        files={"file": ("prices.csv", PRICE_CSV_WITH_PREAMBLE, "text/csv")},
+    )
+
+    assert response.status_code == 200, response.text
+    df = stored["df"]
+    assert df["price"].tolist() == [50.5, 51.0, 49.25]
+    assert set(df["source"]) == {"greenPFC"}
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2024 Jonathan Sejdija
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from forest_ensys import crud
+from forest_ensys.api import deps
+from forest_ensys.api.endpoints import simulation_input_data
+
+DEMAND_CSV_WITH_PREAMBLE = (
+    "Lastgang Gas\n"
+    "Zaehler: 4711\n"
+    "Einheit: m3/h\n"
+    "DateTime;Value\n"
+    "2024-01-01 00:00:00;1.0\n"
+    "2024-01-01 00:15:00;2.0\n"
+    "2024-01-01 00:30:00;3.0\n"
+)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(simulation_input_data.router, prefix="/simulation-input-data")
+    app.dependency_overrides[deps.get_db] = lambda: None
+    return TestClient(app)
+
+
+def test_upload_skips_preamble_with_default_skiprows(client, monkeypatch):
+    stored = {}
+
+    def copy_multi(db, *, obj_in):
+        stored["df"] = obj_in
+        return len(obj_in)
+
+    monkeypatch.setattr(crud.simulation_input_data, "copy_multi", copy_multi)
+
+    response = client.post(
+        "/simulation-input-data/",
+        files={"file": ("demand.csv", DEMAND_CSV_WITH_PREAMBLE, "text/csv")},
+        data={"name": "flexible_device_demand"},
+    )
+
+    assert response.status_code == 200, response.text
+    df = stored["df"]
+    # m³/h with the default heating value 10 and conversion factor 0.8
+    assert df["value"].tolist() == pytest.approx([8.0, 16.0, 24.0])
+    assert set(df["name"]) == {"flexible_device_demand"}